@@ -4,6 +4,7 @@ from tabs.data import DataManager
 from tabs.preprocessing import PreprocessingManager
 from tabs.visualization import VisualizationManager
 from tabs.analysis import AnalysisManager
+from tabs.tasks import TaskExecutor
 
 class DataAnalysisApp:
     def __init__(self, root):
@@ -20,6 +21,11 @@ class DataAnalysisApp:
         style = ttk.Style()
         style.configure('TNotebook.Tab', font=('Arial', 11, 'bold'))
         
+        # Background jobs (load, preprocessing, analysis, plotting) and the status bar
+        self.tasks = TaskExecutor(root)
+        self.tasks.setup_ui(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Initialize managers
         self.data_manager = DataManager(self)
         self.preprocess_manager = PreprocessingManager(self)
@@ -73,6 +79,14 @@ class DataAnalysisApp:
         self.visualization_manager.update_column_comboboxes()
         self.analysis_manager.update_column_comboboxes()
     
+    def run_task(self, label, func, on_done=None, **kwargs):
+        # func(task) runs on a worker thread; on_done(result) back on the mainloop
+        return self.tasks.submit(label, func, on_done=on_done, **kwargs)
+    
+    def on_close(self):
+        self.tasks.shutdown()
+        self.root.destroy()
+    
     def enable_controls(self):
         self.preprocess_manager.enable_controls()
         self.visualization_manager.enable_controls()
@@ -92,56 +92,87 @@ class AnalysisManager:
             return
         
         analysis_type = self.analysis_type.get()
+        x_col = self.var1.get()
+        y_col = self.var2.get()
+        self.show_results("Running analysis...")
+        
+        # The analysis runs on a worker; widgets are only touched on the mainloop
+        source = self.app.data_manager.source
+        if source is not None:
+            work = lambda task: self.streamed_analysis(source, data, analysis_type, x_col, y_col)
+        else:
+            work = lambda task: self.analysis(data, analysis_type, x_col, y_col)
+        if self.app.run_task(f"Running {analysis_type or 'analysis'}", work, lambda result: self.show_results(*result),
+                             on_error=lambda e: self.show_results(f"Analysis failed:\n{str(e)}"),
+                             on_cancel=lambda: self.show_results("Analysis cancelled"), channel='analysis') is None:
+            self.show_results("")
+    
+    def show_results(self, text, exportable=False):
         self.results_text.config(state=tk.NORMAL)
         self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, text)
+        self.results_text.config(state=tk.DISABLED)
+        if exportable:
+            self.export_btn.config(state=tk.NORMAL)
+    
+    def analysis(self, data, analysis_type, x_col, y_col):
+        # Returns (result text, whether it can be exported)
+        # Per-column results are cached until the column changes
+        column_stats = self.app.data_manager.stats
+        if analysis_type == "Descriptive Statistics":
+            stats = column_stats.describe(data).to_string()
+            return "Descriptive Statistics:\n\n" + stats, True
         
-        try:
-            if analysis_type == "Descriptive Statistics":
-                stats = data.describe(include='all').to_string()
-                self.results_text.insert(tk.END, "Descriptive Statistics:\n\n")
-                self.results_text.insert(tk.END, stats)
+        elif analysis_type == "Correlation Matrix":
+            num_cols = data.select_dtypes(include=np.number).columns.tolist()
+            if len(num_cols) < 2:
+                return "Not enough numeric columns for correlation matrix", False
             
-            elif analysis_type == "Correlation Matrix":
-                num_cols = data.select_dtypes(include=np.number).columns.tolist()
-                if len(num_cols) < 2:
-                    self.results_text.insert(tk.END, "Not enough numeric columns for correlation matrix")
-                    return
-                
-                corr = data[num_cols].corr()
-                self.results_text.insert(tk.END, "Correlation Matrix:\n\n")
-                self.results_text.insert(tk.END, corr.to_string())
+            corr = column_stats.corr(data, num_cols)
+            return "Correlation Matrix:\n\n" + corr.to_string(), True
+        
+        elif analysis_type == "Regression Analysis":
+            if not pd.api.types.is_numeric_dtype(data[x_col]) or not pd.api.types.is_numeric_dtype(data[y_col]):
+                return "Both variables must be numeric for regression analysis", False
             
-            elif analysis_type == "Regression Analysis":
-                x_col = self.var1.get()
-                y_col = self.var2.get()
-                
-                if not pd.api.types.is_numeric_dtype(data[x_col]) or not pd.api.types.is_numeric_dtype(data[y_col]):
-                    self.results_text.insert(tk.END, "Both variables must be numeric for regression analysis")
-                    return
-                
-                X = data[x_col].values.reshape(-1, 1)
-                y = data[y_col].values
-                
-                model = LinearRegression().fit(X, y)
-                r_sq = model.score(X, y)
-                intercept = model.intercept_
-                slope = model.coef_[0]
-                
-                self.results_text.insert(tk.END, f"Regression Analysis: {y_col} ~ {x_col}\n\n")
-                self.results_text.insert(tk.END, f"Regression Equation: y = {slope:.4f}x + {intercept:.4f}\n")
-                self.results_text.insert(tk.END, f"Coefficient of Determination (R²): {r_sq:.4f}\n\n")
-                self.results_text.insert(tk.END, "Interpretation:\n")
-                self.results_text.insert(tk.END, f"- For each unit increase in {x_col}, {y_col} changes by {slope:.4f}\n")
-                self.results_text.insert(tk.END, f"- When {x_col} is 0, {y_col} is {intercept:.4f}\n")
-                self.results_text.insert(tk.END, f"- The model explains {r_sq*100:.2f}% of the variability in {y_col}")
+            X = data[x_col].values.reshape(-1, 1)
+            y = data[y_col].values
             
-            # Enable export button
-            self.export_btn.config(state=tk.NORMAL)
+            model = LinearRegression().fit(X, y)
+            r_sq = model.score(X, y)
+            intercept = model.intercept_
+            slope = model.coef_[0]
             
-        except Exception as e:
-            self.results_text.insert(tk.END, f"Analysis failed:\n{str(e)}")
+            return (f"Regression Analysis: {y_col} ~ {x_col}\n\n"
+                    f"Regression Equation: y = {slope:.4f}x + {intercept:.4f}\n"
+                    f"Coefficient of Determination (R²): {r_sq:.4f}\n\n"
+                    "Interpretation:\n"
+                    f"- For each unit increase in {x_col}, {y_col} changes by {slope:.4f}\n"
+                    f"- When {x_col} is 0, {y_col} is {intercept:.4f}\n"
+                    f"- The model explains {r_sq*100:.2f}% of the variability in {y_col}"), True
+        return "", True
+    
+    def streamed_analysis(self, source, data, analysis_type, x_col, y_col):
+        # Out-of-core: each analysis is a single chunked pass over the source
+        if analysis_type == "Descriptive Statistics":
+            return ("Descriptive Statistics (streamed over numeric columns):\n\n"
+                    + source.describe().to_string()), True
         
-        self.results_text.config(state=tk.DISABLED)
+        elif analysis_type == "Correlation Matrix":
+            corr = source.corr()
+            if corr.shape[1] < 2:
+                return "Not enough numeric columns for correlation matrix", False
+            return "Correlation Matrix (streamed):\n\n" + corr.to_string(), True
+        
+        elif analysis_type == "Regression Analysis":
+            if not pd.api.types.is_numeric_dtype(data[x_col]) or not pd.api.types.is_numeric_dtype(data[y_col]):
+                return "Both variables must be numeric for regression analysis", False
+            
+            slope, intercept, r_sq = source.regression(x_col, y_col)
+            return (f"Regression Analysis (streamed): {y_col} ~ {x_col}\n\n"
+                    f"Regression Equation: y = {slope:.4f}x + {intercept:.4f}\n"
+                    f"Coefficient of Determination (R²): {r_sq:.4f}\n"), True
+        return "", True
     
     def export_analysis(self):
         if not self.results_text.get(1.0, tk.END).strip():
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import tempfile
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'data_analysis_tool')
+
+
+class DataCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @property
+    def available(self):
+        return feather is not None
+
+    def key(self, file_path, variant=''):
+        # A changed size or mtime gives a new key, so stale entries are never read
+        stat = os.stat(file_path)
+        raw = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{variant}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def entry_path(self, file_path, variant=''):
+        return os.path.join(self.cache_dir, self.key(file_path, variant) + '.feather')
+
+    def contains(self, file_path, variant=''):
+        try:
+            return self.available and os.path.exists(self.entry_path(file_path, variant))
+        except OSError:
+            return False
+
+    def get(self, file_path, variant=''):
+        if not self.available:
+            return None
+        try:
+            path = self.entry_path(file_path, variant)
+            if not os.path.exists(path):
+                return None
+            # Uncompressed Feather is memory-mapped instead of read into a buffer
+            data = feather.read_table(path, memory_map=True).to_pandas()
+            os.utime(path)  # mark as most recently used
+            return data
+        except Exception:
+            return None
+
+    def put(self, file_path, data, variant=''):
+        if not self.available:
+            return False
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.entry_path(file_path, variant)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            os.close(fd)
+            try:
+                feather.write_feather(data, tmp_path, compression='uncompressed')
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except Exception:
+            # Frames pyarrow cannot represent (mixed object columns, non-string names) are not cached
+            return False
+        self.evict()
+        return True
+
+    def entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.feather'):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits the size cap
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
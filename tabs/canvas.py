@@ -0,0 +1,75 @@
+import tkinter as tk
+import matplotlib as mpl
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+
+class PlotCanvas:
+    # One figure, canvas and toolbar for the lifetime of a tab. Every plot is
+    # drawn into the same figure; the title and axis labels are animated
+    # artists, so editing them only blits over the cached background.
+    def __init__(self, parent, figsize=(10, 6), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasTkAgg(self.figure, parent)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, parent)
+        self.toolbar.update()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.animated = []
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def size(self):
+        return self.canvas.get_width_height()
+
+    def clear(self):
+        # Drops every artist of the previous plot (and the callbacks they hold)
+        self.figure.clear()
+        self.animated = []
+        self.background = None
+        self.toolbar.update()  # forget the previous plot's zoom history
+
+    def apply_style(self):
+        # Figure colours come from the style active while the plot is built
+        self.figure.set_facecolor(mpl.rcParams['figure.facecolor'])
+        self.figure.set_edgecolor(mpl.rcParams['figure.edgecolor'])
+
+    def animate(self, artists):
+        self.animated = [artist for artist in artists if artist is not None]
+        for artist in self.animated:
+            artist.set_animated(True)
+
+    def on_draw(self, event):
+        # Cache everything but the animated artists, then draw those on top.
+        # Exports to PDF/SVG draw through their own canvas, which has no pixels to cache.
+        if event.canvas is not self.canvas:
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.animated:
+            self.figure.draw_artist(artist)
+
+    def draw(self):
+        self.canvas.draw()
+
+    def draw_idle(self):
+        self.canvas.draw_idle()
+
+    def blit(self):
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.animated:
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def savefig(self, file_path, **kwargs):
+        # A normal render skips animated artists, so they are switched off for export
+        for artist in self.animated:
+            artist.set_animated(False)
+        try:
+            self.figure.savefig(file_path, **kwargs)
+        finally:
+            for artist in self.animated:
+                artist.set_animated(True)
+            self.canvas.draw_idle()
@@ -1,11 +1,34 @@
 import pandas as pd
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
+import glob
+import os
+import time
+from tabs.loader import (format_bytes, ChunkedCSVLoader, ParallelLoader, MultiFileLoader, ExcelSheetsLoader, JsonLinesLoader,
+                         is_json_lines, sniff_json_lines, list_excel_sheets)
+from tabs.cache import DataCache
+from tabs.memory import optimize_dtypes, format_memory_report
+from tabs.grid import DataGrid
+from tabs.outofcore import OutOfCoreSource
+from tabs.export import ChunkedExporter, EXPORT_FILE_TYPES
+from tabs.schema import SchemaDialog, sniff_csv
+from tabs.history import History
+from tabs.indexes import IndexManager
+from tabs.stats import ColumnStats
 
 class DataManager:
     def __init__(self, app):
         self.app = app
         self.data = None
+        self.loader = None
+        self.exporter = None
+        self.chunk_size = 200000
+        self.source = None
+        self.cache = DataCache()
+        self.memory_report = None
+        self.history = History()
+        self.indexes = IndexManager()
+        self.stats = ColumnStats()
     
     def setup_ui(self, parent):
         # Header
@@ -23,18 +46,59 @@ class DataManager:
         file_frame = ttk.LabelFrame(parent, text="Data Import")
         file_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        ttk.Button(file_frame, text="Load CSV", command=lambda: self.load_data('csv')).pack(side=tk.LEFT, padx=5, pady=5)
-        ttk.Button(file_frame, text="Load Excel", command=lambda: self.load_data('excel')).pack(side=tk.LEFT, padx=5, pady=5)
-        ttk.Button(file_frame, text="Load JSON", command=lambda: self.load_data('json')).pack(side=tk.LEFT, padx=5, pady=5)
+        self.load_buttons = []
+        for text, file_type in [("Load CSV", 'csv'), ("Load Excel", 'excel'), ("Load JSON", 'json')]:
+            btn = ttk.Button(file_frame, text=text, command=lambda t=file_type: self.load_data(t))
+            btn.pack(side=tk.LEFT, padx=5, pady=5)
+            self.load_buttons.append(btn)
+        
+        # Several files, or every file in a folder matching a glob pattern
+        for text, command in [("Load Files...", self.load_files), ("Load Folder...", self.load_folder)]:
+            btn = ttk.Button(file_frame, text=text, command=command)
+            btn.pack(side=tk.LEFT, padx=5, pady=5)
+            self.load_buttons.append(btn)
+        ttk.Label(file_frame, text="Pattern:").pack(side=tk.LEFT)
+        self.glob_var = tk.StringVar(value="*.csv")
+        ttk.Entry(file_frame, textvariable=self.glob_var, width=12).pack(side=tk.LEFT, padx=5, pady=5)
+        self.add_source_col = tk.BooleanVar(value=True)
+        ttk.Checkbutton(file_frame, text="Add source column", variable=self.add_source_col).pack(side=tk.LEFT, padx=5, pady=5)
+        
+        self.cancel_btn = ttk.Button(file_frame, text="Cancel", command=self.cancel_load, state='disabled')
+        self.cancel_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # Load options
+        options_frame = ttk.LabelFrame(parent, text="Load Options")
+        options_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.optimize_memory = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Optimize memory", variable=self.optimize_memory).pack(side=tk.LEFT, padx=5, pady=5)
+        self.sniff_schema = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Choose columns before load", variable=self.sniff_schema).pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # Columnar cache of previously parsed files
+        self.use_cache = tk.BooleanVar(value=self.cache.available)
+        ttk.Checkbutton(options_frame, text="Use file cache", variable=self.use_cache,
+                        state=tk.NORMAL if self.cache.available else 'disabled').pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Label(options_frame, text="Cache limit (MB):").pack(side=tk.LEFT)
+        self.cache_limit = tk.StringVar(value=str(self.cache.max_bytes // 1024 ** 2))
+        ttk.Spinbox(options_frame, from_=100, to=100000, increment=100, width=8,
+                    textvariable=self.cache_limit).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(options_frame, text="Clear Cache", command=self.clear_cache).pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # Out-of-core mode keeps CSV sources on disk and streams them in chunks
+        self.out_of_core = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Out-of-core mode", variable=self.out_of_core).pack(side=tk.LEFT, padx=(20, 5), pady=5)
+        ttk.Label(options_frame, text="Chunk rows:").pack(side=tk.LEFT)
+        self.chunk_size_var = tk.StringVar(value=str(self.chunk_size))
+        ttk.Spinbox(options_frame, from_=10000, to=10000000, increment=10000, width=10,
+                    textvariable=self.chunk_size_var).pack(side=tk.LEFT, padx=5, pady=5)
         
         # Data Display
         display_frame = ttk.Frame(parent)
         display_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        self.data_text = scrolledtext.ScrolledText(
-            display_frame, wrap=tk.NONE, width=120, height=25
-        )
-        self.data_text.pack(fill=tk.BOTH, expand=True)
+        self.data_grid = DataGrid(display_frame, visible_rows=25)
+        self.data_grid.pack(fill=tk.BOTH, expand=True)
         
         # Data Info
         info_frame = ttk.Frame(parent)
@@ -45,28 +109,401 @@ class DataManager:
         
         self.export_btn = ttk.Button(info_frame, text="Export Data", command=self.export_data, state='disabled')
         self.export_btn.pack(side=tk.RIGHT)
+        
+        # Undo/redo keeps deltas (row masks, changed columns) within a memory budget
+        self.redo_btn = ttk.Button(info_frame, text="Redo", command=self.redo, state='disabled')
+        self.redo_btn.pack(side=tk.RIGHT, padx=5)
+        self.undo_btn = ttk.Button(info_frame, text="Undo", command=self.undo, state='disabled')
+        self.undo_btn.pack(side=tk.RIGHT, padx=5)
+        self.history_budget = tk.StringVar(value=str(self.history.budget_bytes // 1024 ** 2))
+        ttk.Spinbox(info_frame, from_=16, to=100000, increment=64, width=8,
+                    textvariable=self.history_budget).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(info_frame, text="Undo memory (MB):").pack(side=tk.RIGHT)
+        self.app.root.bind_all('<Control-z>', lambda e: self.undo())
+        self.app.root.bind_all('<Control-y>', lambda e: self.redo())
     
     def load_data(self, file_type):
         file_path = filedialog.askopenfilename(
             filetypes=self.get_file_types(file_type))
         if not file_path:
             return
-        
-        try:
+        self.load_file(file_path, file_type)
+    
+    def load_file(self, file_path, file_type):
+        options = self.load_options()
+        if self.out_of_core.get():
             if file_type == 'csv':
-                self.data = pd.read_csv(file_path)
-            elif file_type == 'excel':
-                self.data = pd.read_excel(file_path)
-            elif file_type == 'json':
-                self.data = pd.read_json(file_path)
+                self.start_out_of_core(file_path)
+                return
+            messagebox.showwarning("Warning", "Out-of-core mode supports CSV files only; loading into memory")
+        
+        read_kwargs = {}
+        if file_type == 'csv' and self.sniff_schema.get():
+            try:
+                schema = sniff_csv(file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read file:\n{str(e)}")
+                return
+            chosen = SchemaDialog(self.app.root, file_path, schema).show()
+            if chosen is None:
+                return
+            read_kwargs, variant = chosen
+            options['variant'] += '|' + variant
+        
+        sheet_names = None
+        if file_type == 'excel':
+            try:
+                sheets = list_excel_sheets(file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read workbook:\n{str(e)}")
+                return
+            sheet_names = [name for name, _ in sheets]
+            if len(sheets) > 1:
+                labels = [name if rows is None else f"{name} ({rows:,} rows)" for name, rows in sheets]
+                sheet_names = self.ask_columns("Select Sheets", sheet_names, labels=labels, select_all=False)
+                if not sheet_names:
+                    return
+            options['variant'] += '|sheets=' + ','.join(sheet_names)
+        
+        json_keys = None
+        if file_type == 'json':
+            try:
+                json_lines = is_json_lines(file_path)
+                if json_lines:
+                    json_keys = self.ask_columns("Select JSON Lines Keys", sniff_json_lines(file_path))
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read file:\n{str(e)}")
+                return
+            if json_lines:
+                if not json_keys:
+                    return
+                options['variant'] += '|keys=' + ','.join(json_keys)
+        
+        if options['use_cache'] and self.cache.contains(file_path, options['variant']):
+            # Reading the cached copy runs on a worker like a parse would
+            def work(task):
+                start = time.perf_counter()
+                return self.cache.get(file_path, options['variant']), time.perf_counter() - start
             
-            self.display_data()
-            self.app.enable_controls()
-            self.app.update_column_comboboxes()
-            self.info_label.config(text=f"Data loaded: {self.data.shape[0]} rows, {self.data.shape[1]} columns")
-            self.export_btn.config(state=tk.NORMAL)
-        except Exception as e:
+            def done(result):
+                cached, seconds = result
+                if cached is None:
+                    # The cached copy went away or failed to read; parse instead
+                    self.parse_file(file_path, file_type, dict(options, use_cache=False), read_kwargs, json_keys, sheet_names)
+                    return
+                self.data = cached
+                self.source = None
+                self.memory_report = None
+                self.on_data_loaded(f"cache hit, {seconds:.2f}s")
+            
+            self.app.run_task("Reading cached copy", work, done,
+                              on_error=lambda e: messagebox.showerror("Error", f"Failed to load file:\n{str(e)}"),
+                              channel='data')
+            return
+        self.parse_file(file_path, file_type, options, read_kwargs, json_keys, sheet_names)
+    
+    def parse_file(self, file_path, file_type, options, read_kwargs, json_keys, sheet_names):
+        post_process = lambda data: self.finish_load(file_path, data, options)
+        if file_type == 'csv':
+            self.start_background_load(lambda: ChunkedCSVLoader(
+                file_path, chunk_size=self.chunk_size, post_process=post_process, **read_kwargs))
+            return
+        if json_keys:
+            self.start_background_load(lambda: JsonLinesLoader(
+                file_path, keys=json_keys, chunk_size=self.chunk_size, post_process=post_process))
+            return
+        if sheet_names:
+            # Each selected sheet is parsed in its own worker process
+            self.start_background_load(lambda: ExcelSheetsLoader(
+                file_path, sheet_names, post_process=post_process))
+            return
+        
+        def work(task):
+            start = time.perf_counter()
+            data = self.finish_load(file_path, pd.read_json(file_path), options)
+            return data, time.perf_counter() - start
+        
+        def done(result):
+            self.data, seconds = result
+            self.source = None
+            self.on_data_loaded(f"{self.cache_status()}{seconds:.2f}s")
+        
+        self.app.run_task("Loading data", work, done,
+                          on_error=lambda e: messagebox.showerror("Error", f"Failed to load file:\n{str(e)}"),
+                          channel='data')
+    
+    def load_options(self):
+        # Read Tk variables up front; the worker thread must not touch them
+        try:
+            self.chunk_size = max(1000, int(float(self.chunk_size_var.get())))
+        except ValueError:
+            pass
+        use_cache = self.use_cache.get()
+        if use_cache:
+            try:
+                self.cache.max_bytes = int(float(self.cache_limit.get()) * 1024 ** 2)
+            except ValueError:
+                pass
+        optimize = self.optimize_memory.get()
+        return {
+            'use_cache': use_cache,
+            'optimize': optimize,
+            'variant': 'optimized' if optimize else '',
+        }
+    
+    def finish_load(self, file_path, data, options):
+        self.memory_report = None
+        if options['optimize']:
+            data, self.memory_report = optimize_dtypes(data)
+        if options['use_cache'] and file_path is not None:
+            self.cache.put(file_path, data, options['variant'])
+        return data
+    
+    def cache_status(self):
+        return "cache miss, parsed in " if self.use_cache.get() else "parsed in "
+    
+    def clear_cache(self):
+        self.cache.clear()
+        self.info_label.config(text="File cache cleared")
+    
+    def load_files(self):
+        file_paths = filedialog.askopenfilenames(
+            filetypes=[("Data files", "*.csv *.xlsx *.xls *.json *.jsonl *.ndjson"), ("All files", "*.*")])
+        if file_paths:
+            self.start_multi_load(file_paths)
+    
+    def load_folder(self):
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        pattern = self.glob_var.get().strip() or "*.csv"
+        file_paths = sorted(path for path in glob.glob(os.path.join(folder, pattern), recursive=True)
+                            if os.path.isfile(path))
+        if not file_paths:
+            messagebox.showwarning("Warning", f"No files matching '{pattern}' in:\n{folder}")
+            return
+        self.start_multi_load(file_paths)
+    
+    def start_multi_load(self, file_paths):
+        if len(file_paths) == 1:
+            file_type = {'.xlsx': 'excel', '.xls': 'excel', '.json': 'json', '.jsonl': 'json', '.ndjson': 'json'}.get(
+                os.path.splitext(file_paths[0])[1].lower(), 'csv')
+            self.load_file(file_paths[0], file_type)
+            return
+        
+        options = self.load_options()
+        if self.out_of_core.get():
+            messagebox.showwarning("Warning", "Out-of-core mode loads a single CSV file; loading into memory")
+        options['use_cache'] = False
+        source_column = self.add_source_col.get()
+        self.start_background_load(lambda: MultiFileLoader(
+            file_paths, source_column=source_column,
+            post_process=lambda data: self.finish_load(None, data, options)))
+    
+    def ask_columns(self, title, columns, labels=None, select_all=True, action="Load"):
+        # Modal multi-select list; returns the chosen names, or None if cancelled
+        window = tk.Toplevel(self.app.root)
+        window.title(title)
+        window.transient(self.app.root)
+        
+        listbox = tk.Listbox(window, selectmode=tk.MULTIPLE, width=50, height=20, exportselection=False)
+        for label in labels or columns:
+            listbox.insert(tk.END, label)
+        listbox.select_set(0, tk.END if select_all else 0)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        result = {'columns': None}
+        def accept():
+            result['columns'] = [columns[i] for i in listbox.curselection()]
+            window.destroy()
+        
+        btn_frame = ttk.Frame(window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(btn_frame, text="Select All", command=lambda: listbox.select_set(0, tk.END)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Clear", command=lambda: listbox.select_clear(0, tk.END)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text=action, command=accept).pack(side=tk.RIGHT, padx=5)
+        
+        window.grab_set()
+        self.app.root.wait_window(window)
+        return result['columns']
+    
+    def show_file_timings(self, loader):
+        window = tk.Toplevel(self.app.root)
+        window.title("Load Timing")
+        tree = ttk.Treeview(window, columns=('file', 'rows', 'seconds'), show='headings', height=15)
+        for col, text, width in [('file', loader.unit.capitalize(), 260), ('rows', "Rows", 100), ('seconds', "Seconds", 80)]:
+            tree.heading(col, text=text)
+            tree.column(col, width=width, anchor=tk.W if col == 'file' else tk.E)
+        for name, rows, seconds in sorted(loader.timings, key=lambda t: -t[2]):
+            tree.insert('', tk.END, values=(name, f"{rows:,}", f"{seconds:.2f}"))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        ttk.Label(window, text=f"{len(loader.timings)} {loader.unit} on {loader.max_workers} worker processes, "
+                               f"{loader.elapsed:.1f}s wall time").pack(padx=10, pady=(0, 10))
+    
+    def start_out_of_core(self, file_path):
+        # Sniffing the columns and reading the preview both read the file
+        chunk_size = self.chunk_size
+        
+        def work(task):
+            source = OutOfCoreSource(file_path, chunk_size=chunk_size)
+            return source, source.preview()
+        
+        def done(result):
+            self.source, self.data = result
+            self.memory_report = None
+            self.on_data_loaded()
+        
+        self.app.run_task("Opening file", work, done,
+                          on_error=lambda e: messagebox.showerror("Error", f"Failed to open file:\n{str(e)}"),
+                          channel='data')
+    
+    def refresh_source(self, preview):
+        # Show the preview read after a step was added to the streaming pipeline
+        self.data = preview
+        self.display_data()
+    
+    def start_background_load(self, make_loader):
+        # Parse on a worker thread so the mainloop keeps running
+        try:
+            self.loader = make_loader()
+        except OSError as e:
             messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
+            return
+        
+        if self.app.tasks.run_loader("Loading data", self.loader, self.on_load_finished) is None:
+            self.loader = None
+            return
+        self.set_loading(True)
+        self.show_load_progress(self.loader)
+    
+    def show_load_progress(self, loader):
+        # Rows, bytes and throughput in the info label until the load finishes
+        if self.loader is not loader:
+            return
+        self.info_label.config(text=loader.progress_text())
+        self.app.root.after(250, lambda: self.show_load_progress(loader))
+    
+    def on_load_finished(self, loader):
+        self.loader = None
+        self.set_loading(False)
+        if loader.error is not None:
+            self.info_label.config(text="Load failed")
+            messagebox.showerror("Error", f"Failed to load file:\n{str(loader.error)}")
+        elif loader.cancelled:
+            self.info_label.config(text="Load cancelled" if self.data is None else "Load cancelled, previous data kept")
+        else:
+            self.data = loader.result
+            self.source = None
+            if isinstance(loader, MultiFileLoader):
+                self.on_data_loaded(f"{len(loader.tasks)} files in {loader.elapsed:.1f}s")
+                self.show_file_timings(loader)
+            elif isinstance(loader, ParallelLoader):
+                self.on_data_loaded(f"{self.cache_status()}{loader.elapsed:.1f}s, "
+                                    f"{len(loader.tasks)} {loader.unit} on {loader.max_workers} workers")
+            else:
+                self.on_data_loaded(f"{self.cache_status()}{loader.elapsed:.1f}s")
+    
+    def cancel_load(self):
+        for task in (self.loader, self.exporter):
+            if task is not None:
+                task.cancel()
+                self.info_label.config(text="Cancelling...")
+    
+    def set_loading(self, loading):
+        for btn in self.load_buttons:
+            btn.config(state='disabled' if loading else tk.NORMAL)
+        self.cancel_btn.config(state=tk.NORMAL if loading else 'disabled')
+        if self.data is not None:
+            self.export_btn.config(state='disabled' if loading else tk.NORMAL)
+    
+    def on_data_loaded(self, detail=None):
+        self.app.preprocess_manager.reset_pipeline()
+        self.history.clear()
+        self.indexes.clear()
+        self.stats.attach(self.data)
+        self.update_history_buttons()
+        self.display_data()
+        self.app.enable_controls()
+        self.app.update_column_comboboxes()
+        text = f"Data loaded: {self.data.shape[0]} rows, {self.data.shape[1]} columns"
+        if self.source is not None:
+            text = (f"Out-of-core source: {self.data.shape[1]} columns, "
+                    f"previewing first {self.data.shape[0]} rows, chunks of {self.source.chunk_size:,} rows")
+        if detail:
+            text += f" ({detail})"
+        if self.memory_report is not None:
+            text += f", {format_memory_report(self.memory_report)}"
+        self.info_label.config(text=text)
+        self.export_btn.config(state=tk.NORMAL)
+    
+    def read_history_budget(self):
+        # Read the Tk variable up front; prepare_change() runs on a worker
+        try:
+            self.history.budget_bytes = int(float(self.history_budget.get()) * 1024 ** 2)
+        except ValueError:
+            pass
+    
+    def prepare_change(self, before, data, label, steps=None):
+        # Runs on the step's worker: works out how to get from data back to
+        # before and which columns changed, without touching the history or
+        # the statistics, so a cancelled step leaves both as they were
+        entry = self.history.delta(before, data, label, steps) if self.source is None else None
+        return entry, self.stats.changes(before, data, steps)
+    
+    def commit_change(self, before, data, change):
+        # Replace the current frame, remembering how to get back to it
+        entry, changed = change
+        if entry is not None:
+            self.history.push(entry)
+        self.stats.commit(before, data, changed)
+        self.data = data
+        self.update_history_buttons()
+    
+    def update_history_buttons(self):
+        enabled = self.source is None
+        self.undo_btn.config(state=tk.NORMAL if enabled and self.history.can_undo() else 'disabled')
+        self.redo_btn.config(state=tk.NORMAL if enabled and self.history.can_redo() else 'disabled')
+    
+    def undo(self):
+        self.step_history(undo=True)
+    
+    def redo(self):
+        self.step_history(undo=False)
+    
+    def step_history(self, undo):
+        if self.source is not None or self.data is None:
+            return
+        if not (self.history.can_undo() if undo else self.history.can_redo()):
+            return
+        if self.app.tasks.running('data') is not None:
+            return  # a background step is about to replace the data
+        before = self.data
+        
+        entry = self.history.peek(undo)
+        
+        def work(task):
+            # Applying the inverse operations and finding changed columns both
+            # scan the frame; the stacks only change once the result is swapped in
+            data, inverse = entry.apply(before)
+            return data, inverse, self.stats.changes(before, data, entry.steps)
+        
+        self.app.run_task("Undoing" if undo else "Redoing", work,
+                          lambda result: self.history_stepped(before, entry, result, undo),
+                          on_error=lambda e: messagebox.showerror("Error", f"{'Undo' if undo else 'Redo'} failed:\n{str(e)}"),
+                          channel='data')
+    
+    def history_stepped(self, before, entry, result, undo):
+        data, inverse, changed = result
+        self.history.step(undo, inverse)
+        self.stats.commit(before, data, changed)
+        self.data = data
+        self.app.preprocess_manager.on_history_step(entry.steps, undo)
+        self.update_history_buttons()
+        self.display_data()
+        self.app.update_column_comboboxes()
+        self.info_label.config(text=f"{'Undid' if undo else 'Redid'}: {entry.label} "
+                                    f"({self.data.shape[0]} rows, history {format_bytes(self.history.nbytes)})")
     
     def get_file_types(self, file_type):
         if file_type == 'csv':
@@ -74,31 +511,42 @@ class DataManager:
         elif file_type == 'excel':
             return [("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
         elif file_type == 'json':
-            return [("JSON files", "*.json"), ("All files", "*.*")]
+            return [("JSON files", "*.json *.jsonl *.ndjson"), ("All files", "*.*")]
     
     def display_data(self):
-        self.data_text.config(state=tk.NORMAL)
-        self.data_text.delete(1.0, tk.END)
-        if self.data is not None:
-            self.data_text.insert(tk.END, self.data.head(100).to_string())
-        self.data_text.config(state=tk.DISABLED)
+        self.data_grid.set_data(self.data)
     
     def export_data(self):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("JSON files", "*.json")]
+            filetypes=EXPORT_FILE_TYPES
         )
         if not file_path:
             return
         
-        try:
-            if file_path.endswith('.csv'):
-                self.data.to_csv(file_path, index=False)
-            elif file_path.endswith('.xlsx'):
-                self.data.to_excel(file_path, index=False)
-            elif file_path.endswith('.json'):
-                self.data.to_json(file_path)
-            
-            messagebox.showinfo("Success", f"Data exported successfully to:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export data:\n{str(e)}")
\ No newline at end of file
+        # Written in chunks on a worker thread; progress is polled like a load
+        if self.source is not None:
+            if file_path.lower().endswith(('.xlsx', '.json')):
+                messagebox.showwarning("Warning", "Out-of-core data can only be exported to CSV, Parquet or JSON Lines")
+                return
+            self.exporter = ChunkedExporter(self.source.iter_chunks(), file_path)
+        else:
+            self.exporter = ChunkedExporter(self.data, file_path, chunk_size=self.chunk_size)
+        
+        if self.app.tasks.run_loader("Exporting data", self.exporter, self.on_export_finished, channel='export') is None:
+            self.exporter = None
+            return
+        self.set_loading(True)
+        self.info_label.config(text=self.exporter.progress_text())
+    
+    def on_export_finished(self, exporter):
+        self.exporter = None
+        self.set_loading(False)
+        if exporter.error is not None:
+            self.info_label.config(text="Export failed")
+            messagebox.showerror("Export Error", f"Failed to export data:\n{str(exporter.error)}")
+        elif exporter.cancelled:
+            self.info_label.config(text="Export cancelled")
+        else:
+            self.info_label.config(text=f"Exported {exporter.rows_read:,} rows in {exporter.elapsed:.1f}s")
+            messagebox.showinfo("Success", f"Data exported successfully to:\n{exporter.file_path}")
\ No newline at end of file
@@ -0,0 +1,141 @@
+import warnings
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+
+
+# Lines with more points than this are decimated to the axes width
+DECIMATE_POINTS = 10000
+
+METHODS = {"min-max": 'minmax', "LTTB": 'lttb', "all points": None}
+
+
+def minmax_indices(y, buckets):
+    # Positions of the lowest and highest value in each of `buckets` equal
+    # runs, plus both ends, so every spike survives at two points per bucket
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    full = n // size * size
+    nulls = np.isnan(y)
+    if nulls.any():
+        low, high = np.where(nulls, np.inf, y), np.where(nulls, -np.inf, y)
+    else:
+        low = high = y
+    starts = np.arange(0, full, size)
+    lows = low[:full].reshape(-1, size).argmin(axis=1) + starts
+    highs = high[:full].reshape(-1, size).argmax(axis=1) + starts
+    tail = [low[full:].argmin() + full, high[full:].argmax() + full] if full < n else []
+    return np.unique(np.concatenate([[0, n - 1], lows, highs, tail]).astype(np.intp))
+
+
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: from each bucket keep the point forming
+    # the largest triangle with the previous pick and the next bucket's mean
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN buckets
+        for i in range(threshold - 2):
+            start, end = edges[i], edges[i + 1]
+            next_end = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = x[end:next_end].mean()
+            avg_y = np.nanmean(y[end:next_end])
+            area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+            a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+            selected[i + 1] = a
+    return selected
+
+
+def line_values(x):
+    # x positions as floats (matplotlib date numbers for datetimes); returns (values, is_date)
+    if pd.api.types.is_datetime64_any_dtype(x.dtype):
+        if getattr(x.dtype, 'tz', None) is not None:
+            x = x.tz_localize(None) if isinstance(x, pd.DatetimeIndex) else x.dt.tz_localize(None)
+        return mdates.date2num(x.to_numpy()), True
+    return np.asarray(x, dtype=float), False
+
+
+def can_decimate(x, y):
+    # Only long numeric lines whose x is sorted ascending without gaps
+    if len(x) <= DECIMATE_POINTS or not pd.api.types.is_numeric_dtype(y.dtype):
+        return False
+    if not (pd.api.types.is_numeric_dtype(x.dtype) or pd.api.types.is_datetime64_any_dtype(x.dtype)):
+        return False
+    return not x.isna().any() and x.is_monotonic_increasing
+
+
+class DecimatedLine:
+    # A line that holds about two points per pixel of the axes width: the
+    # visible x-range is re-decimated whenever the toolbar zooms or pans
+    def __init__(self, x, y, method='minmax'):
+        self.x, self.is_date = line_values(x)
+        self.y = np.asarray(y, dtype=float) if not isinstance(y, pd.Series) else y.to_numpy(dtype=float, na_value=np.nan)
+        self.method = method
+        self.line = None
+        self.index = None
+        self.width = None
+        self.span = None
+        self.timer = None
+
+    @property
+    def nbytes(self):
+        index = self.index.nbytes if self.index is not None else 0
+        return self.x.nbytes + self.y.nbytes + index
+
+    def indices(self, start, stop, width):
+        x, y = self.x[start:stop], self.y[start:stop]
+        if self.method == 'lttb':
+            return lttb_indices(x, y, 2 * width) + start
+        return minmax_indices(y, width) + start
+
+    def visible(self, ax):
+        # Index range of the visible x-range, one point wider on each side
+        # so the line still reaches the edges of the axes
+        low, high = sorted(ax.get_xlim())
+        start = max(np.searchsorted(self.x, low, side='left') - 1, 0)
+        stop = min(np.searchsorted(self.x, high, side='right') + 1, len(self.x))
+        return start, stop, int(max(ax.bbox.width, 100))
+
+    def prepare(self, width):
+        # Decimates the full range ahead of draw(), e.g. on a worker thread
+        self.width = int(max(width, 100))
+        self.index = self.indices(0, len(self.x), self.width)
+
+    def draw(self, ax, **kwargs):
+        # The full-range indices are kept, so drawing again into new axes
+        # needs no re-decimation
+        if self.index is None:
+            self.prepare(ax.bbox.width)
+        self.span = (0, len(self.x), self.width)
+        self.timer = None
+        self.line, = ax.plot(self.x[self.index], self.y[self.index], **kwargs)
+        if self.is_date:
+            ax.xaxis_date()
+        # Lambdas keep this object alive as long as the axes (bound methods are weak references)
+        ax.callbacks.connect('xlim_changed', lambda ax: self.on_limits(ax))
+        return self.line
+
+    def on_limits(self, ax):
+        # Limit changes are collapsed into one re-decimation before the next redraw
+        if self.timer is None:
+            self.timer = ax.figure.canvas.new_timer(interval=30)
+            self.timer.single_shot = True
+            self.timer.add_callback(lambda: self.redecimate(ax))
+        self.timer.stop()
+        self.timer.start()
+
+    def redecimate(self, ax):
+        span = self.visible(ax)
+        if span == self.span:
+            return
+        self.span = span
+        index = self.indices(*span)
+        self.line.set_data(self.x[index], self.y[index])
+        ax.figure.canvas.draw_idle()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+def normalize_text(series):
+    # Near-duplicate key: case, punctuation and runs of whitespace are ignored
+    text = series.astype(str).str.lower()
+    text = text.str.replace(r'[^\w\s]', '', regex=True)
+    text = text.str.replace(r'\s+', ' ', regex=True).str.strip()
+    return text.where(series.notna())
+
+
+def is_text(dtype):
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def normalize_column(series):
+    # Categorical text normalizes its categories once and maps them back by
+    # code, so it hashes the same as the equivalent plain text column
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = normalize_text(pd.Series(series.cat.categories, dtype=object)).to_numpy(dtype=object)
+        codes = series.cat.codes.to_numpy()
+        values = np.where(codes >= 0, categories[np.maximum(codes, 0)] if len(categories) else None, None)
+        return pd.Series(values, index=series.index, name=series.name, dtype=object)
+    return normalize_text(series)
+
+
+def row_fingerprints(data, columns=None, normalize=False, chunk_size=500000):
+    # One 64-bit hash per row over the key columns, computed chunk by chunk so
+    # only a chunk's worth of temporaries (normalized text) exists at a time
+    columns = list(data.columns) if not columns else list(columns)
+    fingerprints = np.empty(len(data), dtype=np.uint64)
+    for start in range(0, len(data), chunk_size):
+        chunk = data[columns].iloc[start:start + chunk_size]
+        if normalize:
+            chunk = chunk.copy()
+            for col in columns:
+                dtype = chunk[col].dtype
+                if is_text(dtype) or (isinstance(dtype, pd.CategoricalDtype) and is_text(dtype.categories.dtype)):
+                    chunk[col] = normalize_column(chunk[col])
+        fingerprints[start:start + len(chunk)] = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+    return fingerprints
+
+
+def first_occurrences(data, columns=None, normalize=False):
+    # Boolean mask keeping the first row of every duplicate group
+    fingerprints = pd.Series(row_fingerprints(data, columns, normalize))
+    return ~fingerprints.duplicated(keep='first').to_numpy()
+
+
+class DuplicateReport:
+    # Duplicate rows by fingerprint; the first row of each group is the one kept
+    def __init__(self, data, columns=None, normalize=False):
+        self.columns = list(columns) if columns else list(data.columns)
+        self.normalize = normalize
+        fingerprints = pd.Series(row_fingerprints(data, self.columns, normalize))
+        self.duplicated = fingerprints.duplicated(keep='first').to_numpy()
+        counts = fingerprints.value_counts()
+        self.group_sizes = counts[counts > 1]
+        self.first_positions = pd.Series(np.arange(len(fingerprints)), index=fingerprints.values)
+        self.first_positions = self.first_positions[~self.duplicated]
+        self.rows = len(data)
+
+    @property
+    def duplicate_count(self):
+        return int(self.duplicated.sum())
+
+    @property
+    def group_count(self):
+        return len(self.group_sizes)
+
+    def groups(self, data, limit=100):
+        # Largest groups first, as (rows in group, first row's key values)
+        top = self.group_sizes.head(limit)
+        positions = self.first_positions.reindex(top.index).to_numpy()
+        keys = data[self.columns].iloc[positions]
+        return list(zip(top.to_numpy(), keys.itertuples(index=False, name=None)))
+
+    def summary(self):
+        kind = "near-duplicate" if self.normalize else "duplicate"
+        return (f"{self.duplicate_count:,} {kind} rows in {self.group_count:,} groups "
+                f"out of {self.rows:,} rows")
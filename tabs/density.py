@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from matplotlib.colors import LogNorm
+
+
+# Scatter plots with more rows than this are drawn as a density image
+DENSITY_ROWS = 100000
+
+MAX_BINS = 1000
+
+
+def numeric_values(series):
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+
+def bin_counts(x, y, xlim, ylim, bins):
+    # 2D histogram over uniform bins with one bincount, for points already
+    # inside the limits. Returns counts shaped (ny, nx) for imshow.
+    nx, ny = bins
+    ix = ((x - xlim[0]) * (nx / (xlim[1] - xlim[0]))).astype(np.intp)
+    iy = ((y - ylim[0]) * (ny / (ylim[1] - ylim[0]))).astype(np.intp)
+    # The right and top edges belong to the last bin, as in np.histogram2d
+    np.minimum(ix, nx - 1, out=ix)
+    np.minimum(iy, ny - 1, out=iy)
+    iy *= nx
+    iy += ix
+    return np.bincount(iy, minlength=nx * ny).reshape(ny, nx)
+
+
+def padded_limits(low, high):
+    if not np.isfinite(low) or not np.isfinite(high):
+        return 0.0, 1.0
+    if low == high:
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+class DensityScatter:
+    # Scatter of millions of points drawn as a single image: points are binned
+    # into a grid about the size of the axes in pixels, and the visible range
+    # is re-binned whenever the toolbar zooms or pans
+    def __init__(self, x, y, cmap='viridis'):
+        x = numeric_values(x) if isinstance(x, pd.Series) else np.asarray(x, dtype=float)
+        y = numeric_values(y) if isinstance(y, pd.Series) else np.asarray(y, dtype=float)
+        keep = np.isfinite(x) & np.isfinite(y)
+        if not keep.all():
+            x, y = x[keep], y[keep]
+        self.x = x
+        self.y = y
+        self.cmap = cmap
+        self.extent = ((x.min(), x.max()), (y.min(), y.max())) if len(x) else ((np.nan, np.nan), (np.nan, np.nan))
+        self.xlim = padded_limits(*self.extent[0])
+        self.ylim = padded_limits(*self.extent[1])
+        self.image = None
+        self.counts = None
+        self.limits = None
+        self.timer = None
+        # Points inside the last binned view; zooming in starts from these
+        self.view = (self.xlim, self.ylim, self.x, self.y)
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def nbytes(self):
+        counts = self.counts.data.nbytes if self.counts is not None else 0
+        return self.x.nbytes + self.y.nbytes + counts
+
+    def bins(self, ax):
+        width, height = ax.bbox.width, ax.bbox.height
+        return (int(min(max(width, 50), MAX_BINS)), int(min(max(height, 50), MAX_BINS)))
+
+    def covers(self, xlim, ylim):
+        (x0, x1), (y0, y1) = self.extent
+        return xlim[0] <= x0 and x1 <= xlim[1] and ylim[0] <= y0 and y1 <= ylim[1]
+
+    def visible_points(self, xlim, ylim):
+        if self.covers(xlim, ylim):
+            return self.x, self.y
+        (vx0, vx1), (vy0, vy1), x, y = self.view
+        if not (vx0 <= xlim[0] and xlim[1] <= vx1 and vy0 <= ylim[0] and ylim[1] <= vy1):
+            x, y = self.x, self.y
+        inside = (x >= xlim[0]) & (x <= xlim[1]) & (y >= ylim[0]) & (y <= ylim[1])
+        return x[inside], y[inside]
+
+    def histogram(self, xlim, ylim, bins):
+        x, y = self.visible_points(xlim, ylim)
+        self.view = (xlim, ylim, x, y)
+        counts = bin_counts(x, y, xlim, ylim, bins)
+        return np.ma.masked_equal(counts, 0)
+
+    def prepare(self, bins):
+        # Bins the full extent ahead of draw(), e.g. on a worker thread
+        bins = (int(min(max(bins[0], 50), MAX_BINS)), int(min(max(bins[1], 50), MAX_BINS)))
+        self.counts = self.histogram(self.xlim, self.ylim, bins)
+
+    def draw(self, ax, cmap=None):
+        # Empty bins stay transparent; counts use a log scale so sparse
+        # outliers remain visible next to dense clusters. The full-extent
+        # counts are kept, so drawing again into new axes needs no re-bin.
+        if self.counts is None:
+            self.counts = self.histogram(self.xlim, self.ylim, self.bins(ax))
+        counts = self.counts
+        self.timer = None
+        self.image = ax.imshow(counts, origin='lower', aspect='auto', interpolation='nearest',
+                               extent=(*self.xlim, *self.ylim), cmap=cmap or self.cmap,
+                               norm=LogNorm(vmin=1, vmax=max(counts.max() or 1, 1)))
+        ax.set_xlim(self.xlim)
+        ax.set_ylim(self.ylim)
+        self.limits = (self.xlim, self.ylim)
+        # Lambdas keep this object alive as long as the axes (bound methods are weak references)
+        ax.callbacks.connect('xlim_changed', lambda ax: self.on_limits(ax))
+        ax.callbacks.connect('ylim_changed', lambda ax: self.on_limits(ax))
+        return self.image
+
+    def on_limits(self, ax):
+        # A zoom changes x and y limits one after the other; the timer
+        # collapses both into a single re-bin before the next redraw
+        canvas = ax.figure.canvas
+        if self.timer is None:
+            self.timer = canvas.new_timer(interval=30)
+            self.timer.single_shot = True
+            self.timer.add_callback(lambda: self.rebin(ax))
+        self.timer.stop()
+        self.timer.start()
+
+    def rebin(self, ax):
+        xlim = tuple(sorted(ax.get_xlim()))
+        ylim = tuple(sorted(ax.get_ylim()))
+        if (xlim, ylim) == self.limits:
+            return
+        self.limits = (xlim, ylim)
+        counts = self.histogram(xlim, ylim, self.bins(ax))
+        self.image.set_data(counts)
+        self.image.set_extent((*xlim, *ylim))
+        self.image.set_clim(1, max(counts.max() or 1, 1))
+        ax.figure.canvas.draw_idle()
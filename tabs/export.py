@@ -0,0 +1,133 @@
+import gzip
+import io
+import os
+import time
+import pandas as pd
+from tabs.loader import BackgroundLoader
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+EXPORT_FILE_TYPES = [
+    ("CSV files", "*.csv"),
+    ("Gzip-compressed CSV", "*.csv.gz"),
+    ("Zstandard-compressed CSV", "*.csv.zst"),
+    ("Parquet files", "*.parquet"),
+    ("JSON Lines files", "*.jsonl"),
+    ("Excel files", "*.xlsx"),
+    ("JSON files", "*.json"),
+]
+
+
+def iter_frame_chunks(data, chunk_size):
+    if len(data) == 0:
+        yield data
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start:start + chunk_size]
+
+
+class ChunkedExporter(BackgroundLoader):
+    # Writes chunk by chunk to "<path>.part" and renames it when complete, so
+    # neither the full serialized output nor a half-written file is left behind
+    def __init__(self, data, file_path, chunk_size=200000, total_rows=None):
+        # data is a DataFrame, or an iterable of chunks (e.g. an out-of-core source)
+        super().__init__(0)
+        self.frame = data if isinstance(data, pd.DataFrame) else None
+        self.chunks = iter_frame_chunks(data, chunk_size) if self.frame is not None else data
+        self.file_path = file_path
+        self.total_rows = len(data) if self.frame is not None else total_rows
+        self.part_path = file_path + '.part'
+
+    @property
+    def fraction(self):
+        return self.rows_read / self.total_rows if self.total_rows else None
+
+    def progress_text(self):
+        text = f"Exporting: {self.rows_read:,}"
+        if self.total_rows:
+            text += f" / {self.total_rows:,} rows ({100 * self.rows_read / self.total_rows:.0f}%)"
+        else:
+            text += " rows"
+        rate = self.rows_read / self.elapsed if self.elapsed > 0 else 0
+        return text + f", {rate:,.0f} rows/s"
+
+    def run(self):
+        try:
+            name = self.file_path.lower()
+            if name.endswith('.parquet'):
+                self.write_parquet()
+            elif name.endswith(('.csv', '.csv.gz', '.csv.zst')):
+                self.write_text(lambda chunk, f, first: chunk.to_csv(f, index=False, header=first))
+            elif name.endswith('.jsonl'):
+                self.write_text(lambda chunk, f, first: chunk.to_json(f, orient='records', lines=True, date_format='iso'))
+            elif name.endswith(('.xlsx', '.json')):
+                # Excel and document-style JSON cannot be appended to; written in one go off the UI thread
+                frame = self.frame if self.frame is not None else pd.concat(list(self.chunks))
+                if name.endswith('.xlsx'):
+                    frame.to_excel(self.part_path, index=False, engine='openpyxl')
+                else:
+                    frame.to_json(self.part_path)
+                self.rows_read = len(frame)
+            else:
+                raise ValueError(f"Unsupported export format: {os.path.basename(self.file_path)}")
+
+            if self.cancel_event.is_set():
+                return
+            os.replace(self.part_path, self.file_path)
+        except Exception as e:
+            self.error = e
+        finally:
+            if os.path.exists(self.part_path):
+                os.remove(self.part_path)
+            self.end_time = time.perf_counter()
+            self.done = True
+
+    def open_text(self):
+        name = self.file_path.lower()
+        if name.endswith('.gz'):
+            return gzip.open(self.part_path, 'wt', newline='', encoding='utf-8')
+        if name.endswith('.zst'):
+            if zstandard is None:
+                raise ImportError("Zstandard export requires the 'zstandard' package")
+            raw = open(self.part_path, 'wb')
+            writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+            return io.TextIOWrapper(writer, encoding='utf-8', newline='')
+        return open(self.part_path, 'w', newline='', encoding='utf-8')
+
+    def write_text(self, write_chunk):
+        with self.open_text() as f:
+            first = True
+            for chunk in self.chunks:
+                if self.cancel_event.is_set():
+                    return
+                write_chunk(chunk, f, first)
+                first = False
+                self.rows_read += len(chunk)
+
+    def write_parquet(self):
+        if pq is None:
+            raise ImportError("Parquet export requires the 'pyarrow' package")
+        writer = None
+        try:
+            for chunk in self.chunks:
+                if self.cancel_event.is_set():
+                    return
+                # Each chunk becomes one row group under the first chunk's schema
+                schema = writer.schema if writer is not None else None
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(self.part_path, table.schema, compression='zstd')
+                writer.write_table(table)
+                self.rows_read += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
@@ -0,0 +1,275 @@
+import operator
+import tkinter as tk
+from tkinter import ttk, messagebox
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+COMPARISONS = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt,
+    "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+}
+
+CONDITIONS = list(COMPARISONS) + ["between", "in", "not in", "contains", "is null", "not null"]
+
+NO_VALUE = ("is null", "not null")
+
+
+def parse_value(text):
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_condition_value(cond, text):
+    # "in" takes a comma-separated list, "between" two bounds
+    if cond in NO_VALUE:
+        return None
+    if cond in ("in", "not in"):
+        return [parse_value(part) for part in text.split(",") if part.strip()]
+    if cond == "between":
+        parts = [parse_value(part) for part in text.split(",")]
+        if len(parts) != 2:
+            raise ValueError("between needs two values: low, high")
+        return parts
+    if cond == "contains":
+        return text
+    return parse_value(text)
+
+
+def describe_condition(node):
+    if 'conditions' in node:
+        joiner = f" {node['combine'].upper()} "
+        return "(" + joiner.join(describe_condition(child) for child in node['conditions']) + ")"
+    cond = node['cond']
+    if cond in NO_VALUE:
+        return f"`{node['column']}` {cond}"
+    if cond == "between":
+        return f"`{node['column']}` between {node['value'][0]!r} and {node['value'][1]!r}"
+    return f"`{node['column']}` {cond} {node['value']!r}"
+
+
+def numeric_array(series):
+    # Plain numeric columns go to numexpr as-is; nullable ones only if they hold no NA
+    if pd.api.types.is_bool_dtype(series.dtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+        return None
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    if series.hasnans:
+        return None
+    return series.to_numpy(dtype=series.dtype.numpy_dtype)
+
+
+def leaf_mask(data, node):
+    series = data[node['column']]
+    cond = node['cond']
+    value = node.get('value')
+    if cond == "is null":
+        mask = series.isna()
+    elif cond == "not null":
+        mask = series.notna()
+    elif cond == "in":
+        mask = series.isin(value)
+    elif cond == "not in":
+        mask = ~series.isin(value) & series.notna()
+    elif cond == "between":
+        mask = (series >= value[0]) & (series <= value[1])
+    elif cond == "contains":
+        mask = series.astype(str).str.contains(str(value), case=False, regex=False)
+        mask = mask & series.notna()
+    else:
+        mask = COMPARISONS[cond](series, value)
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
+class MaskCompiler:
+    # Turns a condition tree into one numexpr expression: numeric comparisons
+    # are inlined over the raw column arrays, everything else is evaluated once
+    # by pandas and passed in as a boolean operand
+    def __init__(self, data, indexes=None):
+        self.data = data
+        self.indexes = indexes
+        self.operands = {}
+        self.columns = {}
+
+    def operand(self, array):
+        name = f"m{len(self.operands)}"
+        self.operands[name] = array
+        return name
+
+    def column(self, col):
+        if col not in self.columns:
+            self.columns[col] = numeric_array(self.data[col])
+        return self.columns[col]
+
+    def scalar(self, value):
+        name = f"v{len(self.operands)}"
+        self.operands[name] = value
+        return name
+
+    def compile(self, node):
+        if 'conditions' in node:
+            if not node['conditions']:
+                return "True"
+            joiner = " & " if node['combine'] == 'and' else " | "
+            return "(" + joiner.join(self.compile(child) for child in node['conditions']) + ")"
+
+        cond = node['cond']
+        value = node.get('value')
+        indexed = index_mask(self.data, node, self.indexes)
+        if indexed is not None:
+            return self.operand(indexed)
+        values = value if cond == "between" else [value]
+        array = self.column(node['column']) if cond in COMPARISONS or cond == "between" else None
+        if array is None or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            return self.operand(leaf_mask(self.data, node))
+
+        col = self.operand(array)
+        if cond == "between":
+            return f"(({col} >= {self.scalar(value[0])}) & ({col} <= {self.scalar(value[1])}))"
+        return f"({col} {cond} {self.scalar(value)})"
+
+
+def index_mask(data, node, indexes):
+    if indexes is None:
+        return None
+    return indexes.mask(data, node['column'], node['cond'], node.get('value'))
+
+
+def compile_mask(data, node, indexes=None):
+    # indexes, when given, answers leaves from per-column indexes instead of scanning
+    if numexpr is not None and len(data):
+        compiler = MaskCompiler(data, indexes)
+        expr = compiler.compile(node)
+        if expr == "True":
+            return np.ones(len(data), dtype=bool)
+        return np.asarray(numexpr.evaluate(expr, local_dict=compiler.operands), dtype=bool)
+    return numpy_mask(data, node, indexes)
+
+
+def numpy_mask(data, node, indexes=None):
+    if 'conditions' not in node:
+        indexed = index_mask(data, node, indexes)
+        return indexed if indexed is not None else leaf_mask(data, node)
+    if not node['conditions']:
+        return np.ones(len(data), dtype=bool)
+    masks = [numpy_mask(data, child, indexes) for child in node['conditions']]
+    combine = np.logical_and if node['combine'] == 'and' else np.logical_or
+    return combine.reduce(masks)
+
+
+class FilterBuilder:
+    # Dialog for building nested AND/OR condition groups; returns the tree
+    # that the "where" pipeline step compiles to a single mask
+    def __init__(self, root, columns):
+        self.result = None
+        self.nodes = {}
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Filter Builder")
+        self.window.transient(root)
+
+        self.tree = ttk.Treeview(self.window, show='tree', height=12)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        self.root_id = self.add_group('', 'and')
+        self.tree.selection_set(self.root_id)
+
+        cond_frame = ttk.Frame(self.window)
+        cond_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(cond_frame, text="Column:").pack(side=tk.LEFT)
+        self.column = ttk.Combobox(cond_frame, values=columns, state='readonly', width=18)
+        if columns:
+            self.column.set(columns[0])
+        self.column.pack(side=tk.LEFT, padx=5)
+        self.cond = ttk.Combobox(cond_frame, values=CONDITIONS, state='readonly', width=8)
+        self.cond.set(">")
+        self.cond.pack(side=tk.LEFT, padx=5)
+        self.value = ttk.Entry(cond_frame, width=18)
+        self.value.pack(side=tk.LEFT, padx=5)
+        ttk.Label(cond_frame, text="(lists: a, b, c)").pack(side=tk.LEFT)
+
+        btn_frame = ttk.Frame(self.window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(btn_frame, text="Add Condition", command=self.add_condition).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Add AND Group", command=lambda: self.add_subgroup('and')).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Add OR Group", command=lambda: self.add_subgroup('or')).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Toggle AND/OR", command=self.toggle_group).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Remove", command=self.remove_selected).pack(side=tk.LEFT, padx=5)
+
+        end_frame = ttk.Frame(self.window)
+        end_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(end_frame, text="Cancel", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(end_frame, text="Apply Filter", command=self.accept).pack(side=tk.RIGHT, padx=5)
+
+    def group_text(self, combine):
+        return "ALL of (AND)" if combine == 'and' else "ANY of (OR)"
+
+    def add_group(self, parent, combine):
+        item = self.tree.insert(parent, tk.END, text=self.group_text(combine), open=True)
+        self.nodes[item] = {'combine': combine}
+        return item
+
+    def selected_group(self):
+        # Conditions are added to the selected group, or to the group of the selected condition
+        selection = self.tree.selection()
+        item = selection[0] if selection else self.root_id
+        if 'combine' not in self.nodes[item]:
+            item = self.tree.parent(item)
+        return item
+
+    def add_condition(self):
+        cond = self.cond.get()
+        try:
+            value = parse_condition_value(cond, self.value.get())
+            if cond not in NO_VALUE and value in ("", []):
+                raise ValueError("enter a value")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid value:\n{str(e)}", parent=self.window)
+            return
+        node = {'column': self.column.get(), 'cond': cond, 'value': value}
+        item = self.tree.insert(self.selected_group(), tk.END, text=describe_condition(node))
+        self.nodes[item] = node
+
+    def add_subgroup(self, combine):
+        item = self.add_group(self.selected_group(), combine)
+        self.tree.selection_set(item)
+
+    def toggle_group(self):
+        item = self.selected_group()
+        node = self.nodes[item]
+        node['combine'] = 'or' if node['combine'] == 'and' else 'and'
+        self.tree.item(item, text=self.group_text(node['combine']))
+
+    def remove_selected(self):
+        for item in self.tree.selection():
+            if item != self.root_id and self.tree.exists(item):
+                self.tree.delete(item)
+        self.nodes = {item: node for item, node in self.nodes.items() if self.tree.exists(item)}
+
+    def build(self, item):
+        node = self.nodes[item]
+        if 'combine' not in node:
+            return dict(node)
+        children = [self.build(child) for child in self.tree.get_children(item)]
+        return {'combine': node['combine'], 'conditions': [child for child in children
+                                                          if 'combine' not in child or child['conditions']]}
+
+    def accept(self):
+        where = self.build(self.root_id)
+        if not where['conditions']:
+            messagebox.showwarning("Warning", "Add at least one condition", parent=self.window)
+            return
+        self.result = where
+        self.window.destroy()
+
+    def show(self):
+        self.window.grab_set()
+        self.window.wait_window()
+        return self.result
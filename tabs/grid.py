@@ -0,0 +1,139 @@
+import tkinter as tk
+from tkinter import ttk
+import pandas as pd
+
+
+def format_cell(value):
+    if isinstance(value, float) or value is None or value is pd.NaT or value is pd.NA:
+        if pd.isna(value):
+            return "NaN"
+    return str(value)
+
+
+class DataGrid(ttk.Frame):
+    # Treeview that only holds the rows currently in view; scrolling swaps
+    # their values instead of inserting one item per row of the frame
+    def __init__(self, parent, visible_rows=25, column_width=110, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.data = None
+        self.order = None
+        self.sort_pos = None
+        self.sort_ascending = True
+        self.start = 0
+        self.visible_rows = visible_rows
+        self.column_width = column_width
+
+        self.tree = ttk.Treeview(self, show='headings', height=visible_rows, selectmode='browse')
+        self.vsb = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_vscroll)
+        self.hsb = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.vsb.grid(row=0, column=1, sticky='ns')
+        self.hsb.grid(row=1, column=0, sticky='ew')
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.tree.bind('<Up>', lambda e: self.scroll_by(-1))
+        self.tree.bind('<Down>', lambda e: self.scroll_by(1))
+        self.tree.bind('<Prior>', lambda e: self.scroll_by(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self.scroll_by(self.visible_rows))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0))
+        self.tree.bind('<End>', lambda e: self.scroll_to(self.row_count()))
+
+    def row_count(self):
+        return 0 if self.data is None else len(self.data)
+
+    def set_data(self, data):
+        self.data = data
+        self.order = None
+        self.sort_pos = None
+        self.start = 0
+        self.tree.delete(*self.tree.get_children())
+
+        if data is None:
+            self.tree['columns'] = ()
+            self.vsb.set(0, 1)
+            return
+
+        columns = ['index'] + [f"c{i}" for i in range(data.shape[1])]
+        self.tree['columns'] = columns
+        self.tree.heading('index', text="")
+        self.tree.column('index', width=80, stretch=False, anchor=tk.E)
+        for pos, col in enumerate(data.columns):
+            self.tree.heading(f"c{pos}", text=str(col), command=lambda p=pos: self.sort_by(p))
+            self.tree.column(f"c{pos}", width=self.column_width, stretch=False)
+        self.refresh()
+
+    def sort_by(self, pos):
+        if self.data is None:
+            return
+        if self.sort_pos == pos:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_pos = pos
+            self.sort_ascending = True
+
+        series = self.data.iloc[:, pos].reset_index(drop=True)
+        try:
+            ordered = series.sort_values(ascending=self.sort_ascending, kind='mergesort', na_position='last')
+        except TypeError:
+            # Mixed-type object columns fall back to their string form
+            ordered = series.astype(str).sort_values(ascending=self.sort_ascending, kind='mergesort')
+        self.order = ordered.index.to_numpy()
+
+        arrow = " ▲" if self.sort_ascending else " ▼"
+        for other, col in enumerate(self.data.columns):
+            self.tree.heading(f"c{other}", text=str(col) + (arrow if other == pos else ""))
+        self.start = 0
+        self.refresh()
+
+    def on_resize(self, event):
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        visible = max(1, (event.height - 25) // row_height)
+        if visible != self.visible_rows:
+            self.visible_rows = visible
+            self.refresh()
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def on_vscroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * self.row_count()))
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll_by(int(value) * step)
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.start + rows)
+        return 'break'
+
+    def scroll_to(self, start):
+        last = max(0, self.row_count() - self.visible_rows)
+        start = min(max(0, start), last)
+        if start != self.start or not self.tree.get_children():
+            self.start = start
+            self.refresh()
+        return 'break'
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        total = self.row_count()
+        if total == 0:
+            self.vsb.set(0, 1)
+            return
+
+        self.start = min(self.start, max(0, total - self.visible_rows))
+        end = min(self.start + self.visible_rows, total)
+        positions = range(self.start, end) if self.order is None else self.order[self.start:end]
+        block = self.data.iloc[positions]
+        for row in block.itertuples(index=True, name=None):
+            self.tree.insert('', tk.END, values=[format_cell(v) for v in row])
+        self.vsb.set(self.start / total, end / total)
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+
+def frame_nbytes(data):
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+class RowMask:
+    # Keep only the rows where mask is True
+    def __init__(self, mask):
+        self.mask = mask
+
+    @property
+    def nbytes(self):
+        return self.mask.nbytes
+
+    def apply(self, data):
+        return data.loc[self.mask], RowRestore(self.mask, data.loc[~self.mask])
+
+
+class RowRestore:
+    # Put rows removed by a mask back at their original positions
+    def __init__(self, mask, dropped):
+        self.mask = mask
+        self.dropped = dropped
+
+    @property
+    def nbytes(self):
+        return self.mask.nbytes + frame_nbytes(self.dropped)
+
+    def apply(self, data):
+        combined = pd.concat([data, self.dropped])
+        positions = np.concatenate([np.flatnonzero(self.mask), np.flatnonzero(~self.mask)])
+        restored = combined.iloc[np.argsort(positions, kind='stable')]
+        return restored, RowMask(self.mask)
+
+
+class ColumnPatch:
+    # Column-level delta between two frames with the same rows. Columns whose
+    # values changed in only a few cells (typical for fills) keep just those
+    # cells; anything else keeps the whole column.
+    def __init__(self, full, cells, order):
+        self.full = full
+        self.cells = cells
+        self.order = order
+
+    @classmethod
+    def diff(cls, current, target, cell_ratio=0.5):
+        full = {}
+        cells = {}
+        for col in target.columns:
+            new = target[col]
+            if col not in current.columns:
+                full[col] = new
+                continue
+            old = current[col]
+            if old.dtype != new.dtype:
+                full[col] = new
+                continue
+            if old.equals(new):
+                continue
+            changed = ~((old == new).to_numpy(dtype=bool, na_value=False) | (old.isna() & new.isna()).to_numpy())
+            positions = np.flatnonzero(changed)
+            if len(positions) <= cell_ratio * len(new):
+                cells[col] = (positions, new.iloc[positions].to_numpy())
+            else:
+                full[col] = new
+        if not full and not cells and list(current.columns) == list(target.columns):
+            return None
+        return cls(full, cells, list(target.columns))
+
+    @property
+    def nbytes(self):
+        total = sum(int(series.memory_usage(index=False, deep=True)) for series in self.full.values())
+        for positions, values in self.cells.values():
+            total += positions.nbytes + values.nbytes
+        return total
+
+    def apply(self, data):
+        patched = data.copy(deep=False)
+        for col, series in self.full.items():
+            patched[col] = series.set_axis(patched.index)
+        for col, (positions, values) in self.cells.items():
+            column = patched[col].copy()
+            column.iloc[positions] = values
+            patched[col] = column
+        patched = patched[self.order]
+        return patched, ColumnPatch.diff(patched, data)
+
+
+class Snapshot:
+    # Fallback when a change is neither a row mask nor a column delta
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def nbytes(self):
+        return frame_nbytes(self.data)
+
+    def apply(self, data):
+        return self.data, Snapshot(data)
+
+
+class HistoryEntry:
+    def __init__(self, label, ops, steps=None):
+        self.label = label
+        self.ops = ops
+        self.steps = steps or []
+
+    @property
+    def nbytes(self):
+        return sum(op.nbytes for op in self.ops)
+
+    def apply(self, data):
+        inverse = []
+        for op in self.ops:
+            data, undo = op.apply(data)
+            if undo is not None:
+                inverse.insert(0, undo)
+        return data, HistoryEntry(self.label, inverse, self.steps)
+
+
+class History:
+    # Undo/redo stacks of inverse operations rather than frame copies, with
+    # the oldest entries dropped once the stored deltas exceed the budget
+    def __init__(self, budget_bytes=512 * 1024 ** 2):
+        self.budget_bytes = budget_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def clear(self):
+        self.undo_stack = []
+        self.redo_stack = []
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self.undo_stack + self.redo_stack)
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def record(self, before, after, label, steps=None):
+        self.push(self.delta(before, after, label, steps))
+
+    def delta(self, before, after, label, steps=None):
+        # How to get from after back to before; only read the frames, so it
+        # can run on a worker and be pushed once after has replaced before
+        ops = []
+        kept = before
+        if len(after) < len(before) and before.index.is_unique and after.index.isin(before.index).all():
+            mask = before.index.isin(after.index)
+            kept = before.loc[mask]
+            if kept.index.equals(after.index):
+                ops.append(RowRestore(mask, before.loc[~mask]))
+            else:
+                ops = []
+                kept = before
+        if len(kept) == len(after) and kept.index.equals(after.index):
+            patch = ColumnPatch.diff(after, kept)
+            if patch is not None:
+                ops.insert(0, patch)
+        else:
+            ops = [Snapshot(before)]
+        return HistoryEntry(label, ops, steps)
+
+    def push(self, entry):
+        self.undo_stack.append(entry)
+        self.redo_stack = []
+        self.evict()
+
+    def evict(self):
+        while len(self.undo_stack) > 1 and self.nbytes > self.budget_bytes:
+            self.undo_stack.pop(0)
+
+    def peek(self, undo):
+        return self.undo_stack[-1] if undo else self.redo_stack[-1]
+
+    def step(self, undo, inverse):
+        # Moves the applied entry to the other stack, once its result has
+        # replaced the data
+        if undo:
+            self.undo_stack.pop()
+            self.redo_stack.append(inverse)
+        else:
+            self.redo_stack.pop()
+            self.undo_stack.append(inverse)
+        self.evict()
+
+    def undo(self, data):
+        entry = self.peek(True)
+        data, inverse = entry.apply(data)
+        self.step(True, inverse)
+        return data, entry
+
+    def redo(self, data):
+        entry = self.peek(False)
+        data, inverse = entry.apply(data)
+        self.step(False, inverse)
+        return data, entry
@@ -0,0 +1,173 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+import pandas as pd
+from tabs.stats import is_numeric
+
+
+STRATEGIES = ["none", "mean", "median", "mode", "ffill", "bfill", "interpolate", "value"]
+
+# Strategies that can be computed within groups of another column
+GROUPED = ("mean", "median", "ffill", "bfill")
+
+
+def describe_strategy(strategy):
+    text = strategy['method']
+    if strategy['method'] == 'value':
+        text = f"value {strategy.get('value')!r}"
+    if strategy.get('by'):
+        text += f" by {strategy['by']}"
+    return text
+
+
+def group_strategies(strategies):
+    # Columns sharing a strategy are imputed together in one operation
+    groups = {}
+    for col, strategy in strategies.items():
+        method = strategy['method']
+        by = strategy.get('by') if method in GROUPED else None
+        key = (method, by, strategy.get('value') if method == 'value' else None)
+        groups.setdefault(key, []).append(col)
+    return groups
+
+
+def impute(data, strategies, stats=None):
+    # Returns (imputed frame, report). Scalar fills (mean, median, mode,
+    # value) are applied with one fillna over all their columns, and the
+    # row-wise ones (group transforms, ffill/bfill, interpolate) with a second
+    # fillna from one frame of fill values. Columns sharing a strategy are
+    # computed in one pass and timed together, so report rows are
+    # (columns, strategy, values filled, seconds) per group, followed by a
+    # row for applying all fills, whose values filled is None
+    scalars = {}
+    frames = []
+    groups = group_strategies(strategies)
+    seconds = {}
+    for key, columns in groups.items():
+        method, by, value = key
+        start = time.perf_counter()
+        if by is not None:
+            grouped = data.groupby(by, sort=False, observed=True)[columns]
+            if method in ("ffill", "bfill"):
+                frames.append(getattr(grouped, method)())
+            else:
+                frames.append(grouped.transform(method))
+        elif method in ("ffill", "bfill"):
+            frames.append(getattr(data[columns], method)())
+        elif method == "interpolate":
+            frames.append(data[columns].interpolate(limit_direction='both'))
+        elif method == "value":
+            scalars.update({col: value for col in columns})
+        elif stats is not None:
+            # Global statistics come from the per-column cache
+            for col in columns:
+                if method != "mode" and not is_numeric(data[col]):
+                    continue
+                val = stats.get(data, col, method)
+                if not pd.isna(val):
+                    scalars[col] = val
+        elif method == "mode":
+            modes = data[columns].mode()
+            if len(modes):
+                scalars.update(modes.iloc[0].dropna().to_dict())
+        else:
+            scalars.update(getattr(data[columns], method)(numeric_only=True).dropna().to_dict())
+        seconds[key] = time.perf_counter() - start
+
+    columns = list(strategies)
+    start = time.perf_counter()
+    missing_before = data[columns].isna().sum()
+    result = data.fillna(scalars) if scalars else data.copy(deep=False)
+    if frames:
+        fills = pd.concat(frames, axis=1)
+        result[fills.columns] = result[fills.columns].fillna(fills)
+    filled = missing_before - result[columns].isna().sum()
+    applied = time.perf_counter() - start
+
+    report = [(", ".join(map(str, group)), describe_strategy(strategies[group[0]]), int(filled[group].sum()), seconds[key])
+              for key, group in groups.items()]
+    report.append(("all columns", "apply fills", None, applied))
+    return result, report
+
+
+class ImputeDialog:
+    # Per-column imputation strategies; returns {column: strategy dict}
+    def __init__(self, root, data):
+        self.result = None
+        self.columns = list(data.columns)
+        self.missing = data.isna().sum()
+        self.strategies = {}
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Per-Column Imputation")
+        self.window.transient(root)
+
+        ttk.Label(self.window, text="Select columns, then set their strategy").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        self.tree = ttk.Treeview(self.window, columns=('name', 'missing', 'strategy'),
+                                 show='headings', height=15, selectmode='extended')
+        for col, text, width in [('name', "Column", 220), ('missing', "Missing", 90), ('strategy', "Strategy", 200)]:
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width)
+        for col in self.columns:
+            self.tree.insert('', tk.END, iid=col, values=(col, f"{self.missing[col]:,}", "none"))
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        set_frame = ttk.Frame(self.window)
+        set_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(set_frame, text="Strategy:").pack(side=tk.LEFT)
+        self.method = ttk.Combobox(set_frame, values=STRATEGIES, state='readonly', width=11)
+        self.method.set("mean")
+        self.method.pack(side=tk.LEFT, padx=5)
+        ttk.Label(set_frame, text="Group by:").pack(side=tk.LEFT, padx=(10, 0))
+        self.by = ttk.Combobox(set_frame, values=[""] + self.columns, state='readonly', width=15)
+        self.by.pack(side=tk.LEFT, padx=5)
+        ttk.Label(set_frame, text="Value:").pack(side=tk.LEFT, padx=(10, 0))
+        self.value = ttk.Entry(set_frame, width=10)
+        self.value.pack(side=tk.LEFT, padx=5)
+        ttk.Button(set_frame, text="Set", command=self.set_strategy).pack(side=tk.LEFT, padx=5)
+
+        btn_frame = ttk.Frame(self.window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Select Columns with Missing Values",
+                   command=self.select_missing).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="Impute", command=self.accept).pack(side=tk.RIGHT, padx=5)
+
+    def select_missing(self):
+        self.tree.selection_set([col for col in self.columns if self.missing[col] > 0])
+
+    def set_strategy(self):
+        method = self.method.get()
+        strategy = {'method': method}
+        if method == "value":
+            text = self.value.get().strip()
+            try:
+                strategy['value'] = float(text)
+            except ValueError:
+                strategy['value'] = text
+        by = self.by.get()
+        if by:
+            if method not in GROUPED:
+                messagebox.showwarning("Warning", f"Group by works with: {', '.join(GROUPED)}", parent=self.window)
+                return
+            strategy['by'] = by
+        for col in self.tree.selection():
+            if col == by:
+                continue  # a column cannot be grouped by itself
+            if method == "none":
+                self.strategies.pop(col, None)
+            else:
+                self.strategies[col] = strategy
+            self.tree.set(col, 'strategy', describe_strategy(strategy) if method != "none" else "none")
+
+    def accept(self):
+        if not self.strategies:
+            messagebox.showwarning("Warning", "Set a strategy for at least one column", parent=self.window)
+            return
+        self.result = {col: dict(strategy) for col, strategy in self.strategies.items()}
+        self.window.destroy()
+
+    def show(self):
+        self.window.grab_set()
+        self.window.wait_window()
+        return self.result
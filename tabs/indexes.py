@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+
+def position_dtype(n):
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def remap_positions(mask):
+    # New row number of every kept row after data.loc[mask]
+    return (np.cumsum(mask, dtype=np.int64) - 1).astype(position_dtype(int(mask.sum())))
+
+
+class SortedIndex:
+    # Row positions of a numeric or datetime column sorted by value (missing
+    # values left out), so range and equality predicates are binary searches
+    kind = 'sorted'
+
+    def __init__(self, values, masked=False):
+        # masked: nullable dtype, where missing values are never "!=" anything
+        self.masked = masked
+        valid = ~pd.isna(values)
+        positions = np.flatnonzero(valid).astype(position_dtype(len(values)))
+        order = np.argsort(values[valid], kind='stable')
+        self.n = len(values)
+        self.order = positions[order]
+        self.keys = values[valid][order]
+
+    @classmethod
+    def build(cls, series):
+        if pd.api.types.is_bool_dtype(series.dtype):
+            return None
+        if pd.api.types.is_datetime64_dtype(series.dtype):
+            return cls(series.to_numpy())
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return cls(series.to_numpy(dtype=float, na_value=np.nan), masked=not isinstance(series.dtype, np.dtype))
+        return None
+
+    @property
+    def nbytes(self):
+        return self.order.nbytes + self.keys.nbytes
+
+    def key(self, value):
+        if self.keys.dtype.kind == 'M':
+            return np.datetime64(pd.Timestamp(value).to_datetime64(), np.datetime_data(self.keys.dtype)[0])
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        raise TypeError(f"cannot compare {value!r} with a numeric column")
+
+    def span(self, cond, value):
+        key = self.key(value)
+        if cond == '>':
+            return self.keys.searchsorted(key, 'right'), len(self.keys)
+        if cond == '>=':
+            return self.keys.searchsorted(key, 'left'), len(self.keys)
+        if cond == '<':
+            return 0, self.keys.searchsorted(key, 'left')
+        if cond == '<=':
+            return 0, self.keys.searchsorted(key, 'right')
+        return self.keys.searchsorted(key, 'left'), self.keys.searchsorted(key, 'right')
+
+    def mask(self, cond, value):
+        mask = np.zeros(self.n, dtype=bool)
+        if cond in ('>', '>=', '<', '<=', '=='):
+            start, stop = self.span(cond, value)
+            mask[self.order[start:stop]] = True
+        elif cond == '!=':
+            # NaN and NaT compare unequal, as in a scan; nullable NA does not
+            start, stop = self.span('==', value)
+            if self.masked:
+                mask[self.order] = True
+            else:
+                mask[:] = True
+            mask[self.order[start:stop]] = False
+        elif cond == 'between':
+            start = self.span('>=', value[0])[0]
+            stop = self.span('<=', value[1])[1]
+            mask[self.order[start:max(start, stop)]] = True
+        elif cond == 'in':
+            for item in value:
+                start, stop = self.span('==', item)
+                mask[self.order[start:stop]] = True
+        else:
+            return None
+        return mask
+
+    def take(self, mask):
+        keep = mask[self.order]
+        self.order = remap_positions(mask)[self.order[keep]]
+        self.keys = self.keys[keep]
+        self.n = int(mask.sum())
+
+
+class BitmapIndex:
+    # Row positions grouped by distinct value for categorical and low
+    # cardinality text columns; equality and membership select whole groups
+    kind = 'bitmap'
+
+    def __init__(self, codes, uniques):
+        self.codes = codes
+        self.lookup = {value: code for code, value in enumerate(uniques)}
+        self.order = np.argsort(codes, kind='stable').astype(position_dtype(len(codes)))
+        self.count_groups()
+
+    @classmethod
+    def build(cls, series, max_ratio=0.5):
+        if not (isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(series.dtype)
+                or pd.api.types.is_string_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype)):
+            return None
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        if len(uniques) > max_ratio * max(len(series), 1):
+            return None
+        return cls(codes.astype(position_dtype(len(uniques) + 1)), list(uniques))
+
+    def count_groups(self):
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.lookup))
+        missing = int((self.codes < 0).sum())
+        self.starts = missing + np.concatenate([[0], np.cumsum(counts)])
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.order.nbytes + self.starts.nbytes
+
+    def select(self, mask, value, flag):
+        code = self.lookup.get(value)
+        if code is not None:
+            mask[self.order[self.starts[code]:self.starts[code + 1]]] = flag
+
+    def mask(self, cond, value):
+        n = len(self.codes)
+        if cond in ('==', 'in'):
+            mask = np.zeros(n, dtype=bool)
+            for item in (value if cond == 'in' else [value]):
+                self.select(mask, item, True)
+        elif cond == '!=':
+            mask = np.ones(n, dtype=bool)
+            self.select(mask, value, False)
+        elif cond == 'not in':
+            mask = self.codes >= 0
+            for item in value:
+                self.select(mask, item, False)
+        else:
+            return None
+        return mask
+
+    def take(self, mask):
+        keep = mask[self.order]
+        self.order = remap_positions(mask)[self.order[keep]]
+        self.codes = self.codes[mask]
+        self.count_groups()
+
+
+class IndexManager:
+    # Per-column indexes for the current frame, built the first time a column
+    # is filtered. Row filters remap them in place; conversions and fills drop
+    # the affected columns, and any other frame replaces them all.
+    def __init__(self):
+        self.enabled = False
+        self.frame = None
+        self.indexes = {}
+
+    def clear(self):
+        self.frame = None
+        self.indexes = {}
+
+    @property
+    def nbytes(self):
+        return sum(index.nbytes for index in self.indexes.values() if index is not None)
+
+    def attach(self, data):
+        if data is not self.frame:
+            self.indexes = {}
+            self.frame = data
+
+    def invalidate(self, columns):
+        for col in columns:
+            self.indexes.pop(col, None)
+
+    def take(self, mask, data):
+        # data is the frame after data.loc[mask]
+        for index in self.indexes.values():
+            if index is not None:
+                index.take(mask)
+        self.frame = data
+
+    def mask(self, data, column, cond, value):
+        # Returns None when no index applies, so the caller falls back to a scan
+        if not self.enabled or data is not self.frame:
+            return None
+        if column not in self.indexes:
+            series = data[column]
+            self.indexes[column] = SortedIndex.build(series) or BitmapIndex.build(series)
+        index = self.indexes[column]
+        if index is None:
+            return None
+        try:
+            return index.mask(cond, value)
+        except (TypeError, ValueError):
+            return None
+
+    def summary(self):
+        built = [f"{col} ({index.kind})" for col, index in self.indexes.items() if index is not None]
+        return ", ".join(built) if built else "none"
@@ -0,0 +1,354 @@
+import json
+import os
+import threading
+import time
+import pandas as pd
+
+
+def format_bytes(num_bytes):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+class BackgroundLoader:
+    # self.run is submitted to the TaskExecutor, which polls progress_text() and fraction
+    def __init__(self, total_bytes, post_process=None):
+        self.post_process = post_process
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.rows_read = 0
+        self.start_time = None
+        self.end_time = None
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time if self.end_time is not None else time.perf_counter()
+        return end - self.start_time
+
+    @property
+    def throughput(self):
+        # Bytes per second over the whole load so far
+        elapsed = self.elapsed
+        return self.bytes_read / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def fraction(self):
+        return self.bytes_read / self.total_bytes if self.total_bytes else None
+
+    def progress_text(self):
+        percent = 100 * self.bytes_read / self.total_bytes if self.total_bytes else 100
+        return (f"Loading: {self.rows_read:,} rows, "
+                f"{format_bytes(self.bytes_read)} / {format_bytes(self.total_bytes)} ({percent:.0f}%), "
+                f"{format_bytes(self.throughput)}/s")
+
+
+class ChunkedCSVLoader(BackgroundLoader):
+    def __init__(self, file_path, chunk_size=200000, post_process=None, **read_kwargs):
+        super().__init__(os.path.getsize(file_path), post_process)
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.read_kwargs = read_kwargs
+
+    def run(self):
+        try:
+            chunks = []
+            with open(self.file_path, 'rb') as f:
+                reader = pd.read_csv(f, chunksize=self.chunk_size, **self.read_kwargs)
+                for chunk in reader:
+                    if self.cancel_event.is_set():
+                        return
+                    chunks.append(chunk)
+                    self.rows_read += len(chunk)
+                    self.bytes_read = f.tell()
+            if self.cancel_event.is_set():
+                return
+            self.bytes_read = self.total_bytes
+            if len(chunks) == 1:
+                self.result = chunks[0]
+            elif chunks:
+                self.result = pd.concat(chunks, ignore_index=True)
+                # Chunks with differing categories concatenate to object; restore them
+                for col, dtype in chunks[0].dtypes.items():
+                    if isinstance(dtype, pd.CategoricalDtype) and not isinstance(self.result[col].dtype, pd.CategoricalDtype):
+                        self.result[col] = self.result[col].astype('category')
+            else:
+                self.result = pd.DataFrame()
+            if self.post_process is not None:
+                # Runs on the worker thread too, e.g. writing the file cache
+                self.result = self.post_process(self.result)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.end_time = time.perf_counter()
+            self.done = True
+
+
+SOURCE_COLUMN = 'source_file'
+SHEET_COLUMN = 'sheet'
+
+
+def read_any(file_path):
+    # Module-level so worker processes can unpickle it
+    start = time.perf_counter()
+    name = file_path.lower()
+    if name.endswith(('.xlsx', '.xls')):
+        data = pd.read_excel(file_path)
+    elif name.endswith(('.json', '.jsonl', '.ndjson')):
+        if is_json_lines(file_path):
+            loader = JsonLinesLoader(file_path)
+            loader.run()
+            if loader.error is not None:
+                raise loader.error
+            data = loader.result
+        else:
+            data = pd.read_json(file_path)
+    else:
+        data = pd.read_csv(file_path)
+    return data, time.perf_counter() - start
+
+
+def reconcile_schema(frames):
+    # Union of columns in first-seen order; a column that is numeric in some
+    # files and text (or dates) in others is read as text everywhere
+    columns = []
+    kinds = {}
+    for frame in frames:
+        for col in frame.columns:
+            if col not in kinds:
+                columns.append(col)
+                kinds[col] = set()
+            dtype = frame[col].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                kinds[col].add('bool')
+            elif pd.api.types.is_numeric_dtype(dtype):
+                kinds[col].add('numeric')
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                kinds[col].add('datetime')
+            elif frame[col].notna().any():
+                kinds[col].add('text')
+
+    mixed = [col for col in columns if len(kinds[col]) > 1]
+    if mixed:
+        reconciled = []
+        for frame in frames:
+            frame = frame.copy(deep=False)
+            for col in mixed:
+                if col in frame.columns:
+                    frame[col] = frame[col].astype(str).where(frame[col].notna())
+            reconciled.append(frame)
+        frames = reconciled
+    return frames, columns
+
+
+class ParallelLoader(BackgroundLoader):
+    # Runs one reader call per task in a process pool and concatenates the
+    # results in task order. Tasks are (label, args, size_in_bytes) tuples.
+    unit = "parts"
+
+    def __init__(self, reader, tasks, total_bytes, max_workers=None, source_column=None, post_process=None):
+        super().__init__(total_bytes, post_process)
+        self.reader = reader
+        self.tasks = list(tasks)
+        self.max_workers = max_workers or max(1, min(len(self.tasks), os.cpu_count() or 1))
+        self.source_column = source_column
+        self.timings = []
+
+    def progress_text(self):
+        text = (f"Loading {len(self.timings)}/{len(self.tasks)} {self.unit} on {self.max_workers} workers: "
+                f"{self.rows_read:,} rows, {format_bytes(self.bytes_read)} / {format_bytes(self.total_bytes)}, "
+                f"{format_bytes(self.throughput)}/s")
+        if self.timings:
+            name, rows, seconds = self.timings[-1]
+            text += f" (last: {name}, {rows:,} rows in {seconds:.2f}s)"
+        return text
+
+    def run(self):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        try:
+            frames = {}
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as pool:
+                futures = {pool.submit(self.reader, *args): (i, label, size)
+                           for i, (label, args, size) in enumerate(self.tasks)}
+                for future in as_completed(futures):
+                    if self.cancel_event.is_set():
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return
+                    i, label, size = futures[future]
+                    data, seconds = future.result()
+                    if self.source_column:
+                        data.insert(0, self.source_column, label)
+                    frames[i] = data
+                    self.rows_read += len(data)
+                    self.bytes_read += size
+                    self.timings.append((label, len(data), seconds))
+
+            # Keep the user's order regardless of completion order
+            ordered, columns = reconcile_schema([frames[i] for i in range(len(self.tasks))])
+            result = ordered[0] if len(ordered) == 1 else pd.concat(ordered, ignore_index=True, sort=False)
+            result = result.reindex(columns=columns)
+            if self.source_column:
+                result[self.source_column] = result[self.source_column].astype('category')
+            if self.post_process is not None:
+                result = self.post_process(result)
+            self.result = result
+        except Exception as e:
+            self.error = e
+        finally:
+            self.end_time = time.perf_counter()
+            self.done = True
+
+
+class MultiFileLoader(ParallelLoader):
+    unit = "files"
+
+    def __init__(self, file_paths, max_workers=None, source_column=False, post_process=None):
+        self.file_paths = list(file_paths)
+        sizes = [os.path.getsize(path) for path in self.file_paths]
+        tasks = [(os.path.basename(path), (path,), size) for path, size in zip(self.file_paths, sizes)]
+        super().__init__(read_any, tasks, sum(sizes), max_workers,
+                         SOURCE_COLUMN if source_column else None, post_process)
+
+
+def read_excel_sheet(file_path, sheet_name):
+    start = time.perf_counter()
+    data = pd.read_excel(file_path, sheet_name=sheet_name)
+    return data, time.perf_counter() - start
+
+
+def list_excel_sheets(file_path):
+    # Sheet names and row counts from the workbook's dimension records, without parsing cells
+    if file_path.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            import openpyxl
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                return [(ws.title, max(0, (ws.max_row or 1) - 1)) for ws in workbook.worksheets]
+            finally:
+                workbook.close()
+        except ImportError:
+            pass
+    with pd.ExcelFile(file_path) as workbook:
+        return [(name, None) for name in workbook.sheet_names]
+
+
+class ExcelSheetsLoader(ParallelLoader):
+    unit = "sheets"
+
+    def __init__(self, file_path, sheet_names, max_workers=None, post_process=None):
+        total = os.path.getsize(file_path)
+        share = total // max(1, len(sheet_names))
+        tasks = [(name, (file_path, name), share) for name in sheet_names]
+        super().__init__(read_excel_sheet, tasks, total, max_workers,
+                         SHEET_COLUMN if len(sheet_names) > 1 else None, post_process)
+
+
+def is_json_lines(file_path):
+    # .jsonl/.ndjson by name, otherwise two leading lines that are each an object
+    if file_path.lower().endswith(('.jsonl', '.ndjson')):
+        return True
+    lines = []
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            if len(lines) == 2:
+                break
+    try:
+        return len(lines) == 2 and all(isinstance(json.loads(line), dict) for line in lines)
+    except ValueError:
+        return False
+
+
+def flatten_record(record, keys=None, prefix='', sep='.'):
+    # Nested objects become "parent.child" columns; with keys given, subtrees
+    # that no selected key lives under are skipped
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if keys is None or any(k.startswith(name + sep) for k in keys):
+                flat.update(flatten_record(value, keys, name + sep, sep))
+        elif keys is None or name in keys:
+            flat[name] = json.dumps(value) if isinstance(value, list) else value
+    return flat
+
+
+def sniff_json_lines(file_path, sample_lines=1000):
+    keys = {}
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for key in flatten_record(json.loads(line)):
+                keys.setdefault(key, None)
+            sample_lines -= 1
+            if sample_lines <= 0:
+                break
+    return list(keys)
+
+
+class JsonLinesLoader(BackgroundLoader):
+    # Each chunk of lines becomes a small frame holding only the selected
+    # keys, so peak memory stays near the size of the final frame
+    def __init__(self, file_path, keys=None, chunk_size=200000, post_process=None):
+        super().__init__(os.path.getsize(file_path), post_process)
+        self.file_path = file_path
+        self.keys = list(keys) if keys is not None else None
+        self.chunk_size = chunk_size
+
+    def build_chunk(self, records):
+        return pd.DataFrame.from_records(records, columns=self.keys)
+
+    def run(self):
+        try:
+            keys = set(self.keys) if self.keys is not None else None
+            chunks = []
+            records = []
+            with open(self.file_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    records.append(flatten_record(json.loads(line), keys))
+                    if len(records) >= self.chunk_size:
+                        if self.cancel_event.is_set():
+                            return
+                        chunks.append(self.build_chunk(records))
+                        records = []
+                        self.rows_read += len(chunks[-1])
+                        self.bytes_read = f.tell()
+            if records:
+                chunks.append(self.build_chunk(records))
+                self.rows_read += len(chunks[-1])
+            if self.cancel_event.is_set():
+                return
+            self.bytes_read = self.total_bytes
+            result = pd.concat(chunks, ignore_index=True, sort=False) if chunks else pd.DataFrame(columns=self.keys)
+            if self.keys is not None:
+                result = result.reindex(columns=self.keys)
+            if self.post_process is not None:
+                result = self.post_process(result)
+            self.result = result
+        except Exception as e:
+            self.error = e
+        finally:
+            self.end_time = time.perf_counter()
+            self.done = True
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from tabs.loader import format_bytes
+
+
+def downcast_column(series, category_ratio=0.5):
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series):
+        return series
+
+    if pd.api.types.is_integer_dtype(series):
+        if series.dropna().empty:
+            return series
+        downcast = 'unsigned' if series.min() >= 0 else 'integer'
+        return pd.to_numeric(series, downcast=downcast)
+
+    if pd.api.types.is_float_dtype(series):
+        # Only narrow floats when every value survives the round trip exactly
+        narrowed = series.astype('float32')
+        same = (narrowed.astype(series.dtype) == series) | series.isna()
+        return narrowed if same.all() else series
+
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        if len(series) and series.nunique(dropna=True) <= category_ratio * len(series):
+            return series.astype('category')
+
+    return series
+
+
+def optimize_dtypes(data, category_ratio=0.5):
+    before = data.memory_usage(index=False, deep=True)
+    optimized = data.copy(deep=False)
+    for col in data.columns:
+        optimized[col] = downcast_column(data[col], category_ratio)
+    after = optimized.memory_usage(index=False, deep=True)
+
+    report = pd.DataFrame({
+        'before': before,
+        'after': after,
+        'dtype_before': data.dtypes.astype(str),
+        'dtype_after': optimized.dtypes.astype(str),
+    })
+    report['saved'] = report['before'] - report['after']
+    return optimized, report
+
+
+def format_memory_report(report, max_columns=4):
+    before = report['before'].sum()
+    after = report['after'].sum()
+    ratio = before / after if after else np.inf
+    text = f"memory {format_bytes(before)} -> {format_bytes(after)} ({ratio:.1f}x smaller)"
+
+    changed = report[report['saved'] > 0].sort_values('saved', ascending=False)
+    parts = [f"{col}: {format_bytes(row['before'])} -> {format_bytes(row['after'])}"
+             for col, row in changed.head(max_columns).iterrows()]
+    if len(changed) > max_columns:
+        parts.append(f"+{len(changed) - max_columns} more")
+    if parts:
+        text += " [" + "; ".join(parts) + "]"
+    return text
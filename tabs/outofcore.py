@@ -0,0 +1,208 @@
+import os
+import numpy as np
+import pandas as pd
+from tabs.sketches import approximate_fill_values
+
+
+class OutOfCoreSource:
+    # A CSV that stays on disk. Preprocessing is recorded as steps replayed on
+    # every chunk, and analysis runs as streaming passes, so memory is bounded
+    # by the chunk size rather than the file size.
+    def __init__(self, file_path, chunk_size=200000, preview_rows=1000):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.preview_rows = preview_rows
+        self.steps = []
+        self.rows = None  # row count after the steps, once counted
+        self.fill_bounds = {}
+        self.total_bytes = os.path.getsize(file_path)
+        self.dtypes = pd.read_csv(file_path, nrows=1000).dtypes
+
+    @property
+    def columns(self):
+        return list(self.dtypes.index)
+
+    def add_step(self, description, func):
+        self.steps.append((description, func))
+
+    def iter_raw_chunks(self):
+        # Text columns are pinned from the sniffed head so every chunk agrees
+        text_cols = {col: str for col, dtype in self.dtypes.items()
+                     if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)}
+        return pd.read_csv(self.file_path, chunksize=self.chunk_size, dtype=text_cols)
+
+    def iter_chunks(self, steps=None):
+        # `steps` replaces the recorded steps, e.g. to preview steps not yet added
+        steps = self.steps if steps is None else steps
+        for chunk in self.iter_raw_chunks():
+            for _, func in steps:
+                chunk = func(chunk)
+            if len(chunk):
+                yield chunk
+
+    def preview(self, steps=None):
+        parts = []
+        rows = 0
+        for chunk in self.iter_chunks(steps):
+            parts.append(chunk.head(self.preview_rows - rows))
+            rows += len(parts[-1])
+            if rows >= self.preview_rows:
+                break
+        if not parts:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(parts)
+
+    def row_count(self, steps=None):
+        return sum(len(chunk) for chunk in self.iter_chunks(steps))
+
+    def iter_numeric(self, text_columns):
+        # Numeric columns of each chunk as floats. Types are only sniffed from
+        # the head, so a column that is empty there can hold text further
+        # down; it is then demoted to text: added to text_columns and left out
+        # of this and every later chunk, and callers drop what they already
+        # accumulated for it
+        for chunk in self.iter_chunks():
+            numeric = chunk.select_dtypes(include=np.number)
+            text_columns.update(col for col in chunk.columns if col not in numeric.columns)
+            yield numeric[[col for col in numeric.columns if col not in text_columns]].astype(float)
+
+    def fill_values(self, method, approximate=False):
+        text_columns = set()
+        if approximate:
+            # Fixed-size sketches instead of per-value counts; bounds kept for display
+            chunks = self.iter_numeric(text_columns) if method == 'median' else self.iter_chunks()
+            values, bounds = approximate_fill_values(chunks, method)
+            self.fill_bounds = {col: bound for col, bound in bounds.items() if col not in text_columns}
+            return {col: value for col, value in values.items() if col not in text_columns}
+        if method == 'mean':
+            sums = None
+            counts = None
+            for numeric in self.iter_numeric(text_columns):
+                sums = numeric.sum() if sums is None else sums.add(numeric.sum(), fill_value=0)
+                counts = numeric.count() if counts is None else counts.add(numeric.count(), fill_value=0)
+            if sums is None:
+                return pd.Series(dtype=float)
+            return (sums / counts).drop(text_columns, errors='ignore')
+
+        # Median and mode merge per-column value counts, so memory grows with
+        # the number of distinct values rather than the number of rows
+        value_counts = {}
+        chunks = self.iter_numeric(text_columns) if method == 'median' else self.iter_chunks()
+        for chunk in chunks:
+            for col in chunk.columns:
+                counts = chunk[col].value_counts()
+                value_counts[col] = counts if col not in value_counts else value_counts[col].add(counts, fill_value=0)
+
+        values = {}
+        for col, counts in value_counts.items():
+            if counts.empty or col in text_columns:
+                continue
+            if method == 'median':
+                counts = counts.sort_index()
+                cumulative = counts.cumsum()
+                total = cumulative.iloc[-1]
+                lower = counts.index[cumulative.searchsorted(total / 2)]
+                upper = counts.index[cumulative.searchsorted(total / 2 + 1)] if total % 2 == 0 else lower
+                values[col] = (lower + upper) / 2
+            else:
+                values[col] = counts.idxmax()
+        return values
+
+    def describe(self):
+        count = sums = minimum = maximum = None
+        shift = None
+        sq_sums = None
+        text_columns = set()
+        for numeric in self.iter_numeric(text_columns):
+            if shift is None:
+                shift = numeric.mean().fillna(0)
+            centered = numeric - shift
+            if count is None:
+                count, sums, sq_sums = numeric.count(), centered.sum(), (centered ** 2).sum()
+                minimum, maximum = numeric.min(), numeric.max()
+            else:
+                count = count.add(numeric.count(), fill_value=0)
+                sums = sums.add(centered.sum(), fill_value=0)
+                sq_sums = sq_sums.add((centered ** 2).sum(), fill_value=0)
+                minimum = np.fmin(minimum, numeric.min())
+                maximum = np.fmax(maximum, numeric.max())
+        if count is None:
+            return pd.DataFrame()
+
+        mean = sums / count
+        variance = (sq_sums - count * mean ** 2) / (count - 1)
+        return pd.DataFrame({
+            'count': count,
+            'mean': mean + shift,
+            'std': np.sqrt(variance.clip(lower=0)),
+            'min': minimum,
+            'max': maximum,
+        }).drop(text_columns, errors='ignore').T
+
+    def corr(self):
+        # Pairwise-complete Pearson correlation from accumulated co-moments
+        columns = None
+        shift = None
+        n = sx = sxx = sxy = None
+        text_columns = set()
+        for numeric in self.iter_numeric(text_columns):
+            if columns is None:
+                columns = numeric.columns.tolist()
+                shift = numeric.mean().fillna(0).to_numpy()
+                k = len(columns)
+                n, sx, sxx, sxy = (np.zeros((k, k)) for _ in range(4))
+            keep = [i for i, col in enumerate(columns) if col not in text_columns]
+            if len(keep) < len(columns):
+                # Demoted columns leave the co-moment matrices
+                columns = [columns[i] for i in keep]
+                shift = shift[keep]
+                n, sx, sxx, sxy = (m[np.ix_(keep, keep)] for m in (n, sx, sxx, sxy))
+            if len(columns) < 2:
+                return pd.DataFrame(index=columns, columns=columns)
+            values = numeric[columns].to_numpy() - shift
+            present = ~np.isnan(values)
+            values = np.where(present, values, 0.0)
+            mask = present.astype(float)
+            n += mask.T @ mask
+            sx += values.T @ mask
+            sxx += (values ** 2).T @ mask
+            sxy += values.T @ values
+        if columns is None:
+            return pd.DataFrame()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = n * sxy - sx * sx.T
+            var_x = n * sxx - sx ** 2
+            corr = cov / np.sqrt(var_x * var_x.T)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def regression(self, x_col, y_col):
+        n = sx = sy = sxx = sxy = syy = 0.0
+        x0 = y0 = None
+        for chunk in self.iter_chunks():
+            for col in (x_col, y_col):
+                if not pd.api.types.is_numeric_dtype(chunk[col].dtype):
+                    raise ValueError(f"Column '{col}' holds text further down the file")
+            pair = chunk[[x_col, y_col]].dropna().astype(float)
+            if pair.empty:
+                continue
+            if x0 is None:
+                x0, y0 = pair[x_col].mean(), pair[y_col].mean()
+            x = pair[x_col].to_numpy() - x0
+            y = pair[y_col].to_numpy() - y0
+            n += len(x)
+            sx += x.sum()
+            sy += y.sum()
+            sxx += (x * x).sum()
+            sxy += (x * y).sum()
+            syy += (y * y).sum()
+        if n < 2:
+            raise ValueError("Not enough rows with both values present")
+
+        ssx = sxx - sx * sx / n
+        ssy = syy - sy * sy / n
+        spxy = sxy - sx * sy / n
+        slope = spxy / ssx
+        intercept = (sy / n + y0) - slope * (sx / n + x0)
+        r_sq = spxy ** 2 / (ssx * ssy) if ssy else 1.0
+        return slope, intercept, r_sq
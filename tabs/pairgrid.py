@@ -0,0 +1,136 @@
+import os
+import numpy as np
+from matplotlib.colors import LogNorm
+from tabs.density import bin_counts, padded_limits
+
+
+PAIR_COLUMNS = 8
+PAIR_SAMPLE = 200000
+PAIR_BINS = 60
+
+# Binning one panel is a single bincount, so worker processes only pay for
+# their start-up beyond this many rows times panels
+PARALLEL_POINTS = 200000000
+
+_matrix = None
+_limits = None
+
+
+def pair_matrix(data, columns, sample=PAIR_SAMPLE, seed=0):
+    # One float row per column (optionally over a row sample) and each column's limits
+    if sample and len(data) > sample:
+        data = data.sample(sample, random_state=seed)
+    matrix = np.vstack([data[col].to_numpy(dtype=float, na_value=np.nan) for col in columns])
+    limits = []
+    for values in matrix:
+        finite = values[np.isfinite(values)]
+        limits.append(padded_limits(finite.min(), finite.max()) if len(finite) else (0.0, 1.0))
+    return matrix, limits
+
+
+def column_histograms(matrix, limits, bins=PAIR_BINS):
+    # Diagonal panels: each column's histogram is computed once
+    return [np.histogram(values[np.isfinite(values)], bins=bins, range=lim)[0]
+            for values, lim in zip(matrix, limits)]
+
+
+def init_worker(matrix, limits):
+    # Pool initializer: every worker process receives the columns once
+    global _matrix, _limits
+    _matrix, _limits = matrix, limits
+
+
+def panel_counts(i, j, bins=PAIR_BINS):
+    # Panel in row i, column j: x is column j and y is column i
+    x, y = _matrix[j], _matrix[i]
+    keep = np.isfinite(x) & np.isfinite(y)
+    return i, j, bin_counts(x[keep], y[keep], _limits[j], _limits[i], (bins, bins))
+
+
+def pair_counts(task, data, columns, sample=PAIR_SAMPLE):
+    # Runs on a task thread: histograms first, then the 2D panels from a
+    # process pool; each result is emitted as soon as it is ready
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from tabs.tasks import TaskCancelled
+
+    matrix, limits = pair_matrix(data, columns, sample)
+    task.emit(('limits', limits))
+    task.emit(('histograms', column_histograms(matrix, limits)))
+    pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+    task.check()
+
+    workers = max(1, min(len(pairs), os.cpu_count() or 1))
+    if workers == 1 or matrix.shape[1] * len(pairs) < PARALLEL_POINTS:
+        init_worker(matrix, limits)
+        for done, (i, j) in enumerate(pairs, 1):
+            task.check()
+            task.emit(('panel', panel_counts(i, j)))
+            task.set_progress(done / len(pairs), f"{done}/{len(pairs)} panels")
+        return len(columns)
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_worker, initargs=(matrix, limits)) as pool:
+        futures = [pool.submit(panel_counts, i, j) for i, j in pairs]
+        for done, future in enumerate(as_completed(futures), 1):
+            if task.cancelled:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise TaskCancelled()
+            task.emit(('panel', future.result()))
+            task.set_progress(done / len(pairs), f"{done}/{len(pairs)} panels")
+    return len(columns)
+
+
+class PairGrid:
+    # Pair plot on one Figure: histograms on the diagonal and binned 2D counts
+    # off it, drawn panel by panel as their counts arrive
+    def __init__(self, figure, columns, color='#3498db', cmap='viridis'):
+        self.figure = figure
+        self.columns = list(columns)
+        self.color = color
+        self.cmap = cmap
+        self.limits = None
+        # Artists drawn in the colour and with the colormap, for restyling in place
+        self.patches = []
+        self.images = []
+        k = len(self.columns)
+        self.axes = figure.subplots(k, k, squeeze=False)
+        for i in range(k):
+            for j in range(k):
+                ax = self.axes[i][j]
+                ax.tick_params(labelsize=7)
+                if i < k - 1:
+                    ax.tick_params(labelbottom=False)
+                else:
+                    ax.set_xlabel(self.columns[j], fontsize=8)
+                if j > 0:
+                    ax.tick_params(labelleft=False)
+                else:
+                    ax.set_ylabel(self.columns[i], fontsize=8)
+        figure.subplots_adjust(left=0.08, right=0.98, bottom=0.08, top=0.92, wspace=0.05, hspace=0.05)
+
+    def update(self, update):
+        kind, payload = update
+        if kind == 'limits':
+            self.limits = payload
+        elif kind == 'histograms':
+            for i, counts in enumerate(payload):
+                self.draw_histogram(i, counts)
+        else:
+            self.draw_panel(*payload)
+
+    def draw_histogram(self, i, counts):
+        ax = self.axes[i][i]
+        edges = np.linspace(*self.limits[i], len(counts) + 1)
+        self.patches.append(ax.stairs(counts, edges, fill=True, color=self.color))
+        ax.set_xlim(self.limits[i])
+        ax.tick_params(labelleft=False)  # counts, not the row's column values
+
+    def draw_panel(self, i, j, counts):
+        # The mirrored panel shows the same counts transposed
+        for row, col, grid in ((i, j, counts), (j, i, counts.T)):
+            ax = self.axes[row][col]
+            self.images.append(ax.imshow(np.ma.masked_equal(grid, 0), origin='lower', aspect='auto',
+                                         interpolation='nearest', extent=(*self.limits[col], *self.limits[row]),
+                                         cmap=self.cmap, norm=LogNorm(vmin=1, vmax=max(grid.max(), 1))))
@@ -0,0 +1,254 @@
+import json
+import sys
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from tabs.filters import COMPARISONS, compile_mask, describe_condition
+from tabs.sketches import approximate_fill_values
+from tabs.export import iter_frame_chunks
+from tabs.impute import impute, describe_strategy
+from tabs.dedup import first_occurrences
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+
+RECIPE_VERSION = 1
+
+MASK_OPS = ('filter', 'where', 'dropna')
+
+# Conversions of different columns run side by side on a thread pool
+CONVERT_WORKERS = 4
+
+
+def infer_datetime_format(values):
+    formats = Counter(guess_datetime_format(value) for value in values if isinstance(value, str))
+    formats.pop(None, None)
+    return formats.most_common(1)[0][0] if formats else None
+
+
+def parse_datetimes(series, sample_size=100):
+    # Text dates repeat heavily, so each distinct value is parsed once with a
+    # format inferred from a sample, and the results are mapped back by code;
+    # categorical columns already hold their distinct values and codes
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+        codes, uniques = pd.factorize(series)
+    else:
+        return pd.to_datetime(series, errors='coerce')
+    uniques = pd.Series(uniques, dtype=object)
+    fmt = infer_datetime_format(uniques.iloc[:sample_size])
+    if fmt is None:
+        parsed = pd.to_datetime(uniques, errors='coerce')
+    else:
+        parsed = pd.to_datetime(uniques, format=fmt, errors='coerce')
+        failed = parsed.isna()
+        if failed.any():
+            # Values in another layout fall back to per-value inference
+            parsed = parsed.astype(object)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                parsed[failed] = pd.to_datetime(uniques[failed], errors='coerce')
+            parsed = pd.to_datetime(parsed, errors='coerce')
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=series.index, name=series.name)
+
+
+def convert_column(series, target_type):
+    if target_type == "numeric":
+        return pd.to_numeric(series, errors='coerce')
+    elif target_type == "string":
+        return series.astype(str)
+    elif target_type == "datetime":
+        return parse_datetimes(series)
+    elif target_type == "category":
+        return series.astype('category')
+    return series
+
+
+def step_mask(data, step, indexes=None):
+    if step['op'] == 'dropna':
+        mask = data.notna().all(axis=1)
+    elif step['op'] == 'where':
+        return compile_mask(data, step['where'], indexes)
+    else:
+        if indexes is not None:
+            indexed = indexes.mask(data, step['column'], step['cond'], step['value'])
+            if indexed is not None:
+                return indexed
+        mask = COMPARISONS[step['cond']](data[step['column']], step['value'])
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
+def fill_values(data, method, value=None, stats=None, approximate=False):
+    # stats, when given, is the ColumnStats cache for data
+    if stats is not None and method != "custom":
+        return stats.fill_values(data, method, approximate)
+    if approximate:
+        return approximate_fill_values(iter_frame_chunks(data, 200000), method)[0]
+    if method == "mean":
+        values = data.mean(numeric_only=True)
+    elif method == "median":
+        values = data.median(numeric_only=True)
+    elif method == "mode":
+        modes = data.mode()
+        values = modes.iloc[0] if len(modes) else pd.Series(dtype=object)
+    elif method == "custom":
+        return {col: value for col in data.columns}
+    else:
+        raise ValueError(f"Unknown fill method: {method}")
+    return {col: val for col, val in values.items() if not pd.isna(val)}
+
+
+def describe_step(step):
+    if step['op'] == 'filter':
+        return f"filter `{step['column']}` {step['cond']} {step['value']!r}"
+    if step['op'] == 'where':
+        return f"filter {describe_condition(step['where'])}"
+    if step['op'] == 'dropna':
+        return "drop rows with missing values"
+    if step['op'] == 'fill':
+        if step['method'] == 'custom':
+            return f"fill missing with {step['value']!r}"
+        if step.get('approximate'):
+            return f"fill missing with approximate {step['method']}"
+        return f"fill missing with {step['method']}"
+    if step['op'] == 'impute':
+        strategies = ", ".join(f"{col}: {describe_strategy(strategy)}" for col, strategy in step['strategies'].items())
+        return f"impute {strategies}"
+    if step['op'] == 'dedup':
+        kind = "near-duplicate" if step.get('normalize') else "duplicate"
+        on = f" on {', '.join(step['columns'])}" if step.get('columns') else ""
+        return f"remove {kind} rows{on}"
+    if step['op'] == 'convert':
+        return f"convert `{step['column']}` to {step['target']}"
+    return step['op']
+
+
+class Pipeline:
+    # Ordered preprocessing steps (plain dicts, so a pipeline saves as a JSON
+    # recipe). Running it fuses adjacent row masks (filters, dropna) into one
+    # boolean index and adjacent fills into one fillna call.
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+        self.report = []  # (columns, strategy, filled, seconds) rows from the last run's imputations
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, step):
+        self.steps.append(step)
+
+    def clear(self):
+        self.steps = []
+
+    def fuse(self):
+        groups = []
+        for step in self.steps:
+            kind = 'mask' if step['op'] in MASK_OPS else step['op']
+            if groups and kind in ('mask', 'fill', 'convert') and groups[-1][0] == kind:
+                groups[-1][1].append(step)
+            else:
+                groups.append((kind, [step]))
+        return groups
+
+    def run(self, data, indexes=None, stats=None):
+        # indexes (an IndexManager) serves filters from per-column indexes
+        # and is kept in step with the frame as the steps change it; stats
+        # (a ColumnStats) supplies fill values while the frame is unchanged
+        working = data
+        self.report = []
+        if indexes is not None:
+            indexes.attach(data)
+        for kind, steps in self.fuse():
+            if kind == 'mask':
+                mask = step_mask(working, steps[0], indexes)
+                for step in steps[1:]:
+                    mask = mask & step_mask(working, step, indexes)
+                working = working.loc[mask]
+                if indexes is not None:
+                    indexes.take(mask, working)
+            elif kind == 'fill':
+                # Every fill sees the same input; the first fill to provide a
+                # value for a column wins, exactly as when applied one by one
+                merged = {}
+                for step in steps:
+                    cached = stats if working is data else None
+                    for col, val in fill_values(working, step['method'], step.get('value'), cached,
+                                                step.get('approximate', False)).items():
+                        merged.setdefault(col, val)
+                working = working.fillna(merged)
+                if indexes is not None:
+                    indexes.invalidate(merged)
+                    indexes.frame = working
+            elif kind == 'dedup':
+                # Not fused with filters: which row is first depends on the rows left
+                step = steps[0]
+                mask = first_occurrences(working, step.get('columns'), step.get('normalize', False))
+                working = working.loc[mask]
+                if indexes is not None:
+                    indexes.take(mask, working)
+            elif kind == 'impute':
+                step = steps[0]
+                working, report = impute(working, step['strategies'], stats if working is data else None)
+                self.report.extend(report)
+                if indexes is not None:
+                    indexes.invalidate(step['strategies'])
+                    indexes.frame = working
+            elif kind == 'convert':
+                if working is data:
+                    working = working.copy(deep=False)  # never mutate the caller's frame
+                columns = [step['column'] for step in steps]
+                if len(set(columns)) == len(columns) and len(steps) > 1:
+                    with ThreadPoolExecutor(max_workers=min(CONVERT_WORKERS, len(steps))) as pool:
+                        converted = list(pool.map(
+                            lambda step: convert_column(working[step['column']], step['target']), steps))
+                    for col, series in zip(columns, converted):
+                        working[col] = series
+                else:
+                    # The same column converted twice must convert in order
+                    for step in steps:
+                        working[step['column']] = convert_column(working[step['column']], step['target'])
+                if indexes is not None:
+                    indexes.invalidate(columns)
+                    indexes.frame = working
+            else:
+                raise ValueError(f"Unknown pipeline step: {kind}")
+        return working
+
+    def save(self, file_path):
+        with open(file_path, 'w') as f:
+            json.dump({'version': RECIPE_VERSION, 'steps': self.steps}, f, indent=2)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path) as f:
+            recipe = json.load(f)
+        if recipe.get('version') != RECIPE_VERSION:
+            raise ValueError(f"Unsupported recipe version: {recipe.get('version')}")
+        return cls(recipe['steps'])
+
+
+def replay(recipe_path, input_path, output_path):
+    from tabs.loader import read_any
+    from tabs.export import ChunkedExporter
+
+    data, _ = read_any(input_path)
+    result = Pipeline.load(recipe_path).run(data)
+    exporter = ChunkedExporter(result, output_path)
+    exporter.run()
+    if exporter.error is not None:
+        raise exporter.error
+    return result
+
+
+if __name__ == "__main__":
+    # Headless replay: python -m tabs.pipeline recipe.json input.csv output.csv
+    if len(sys.argv) != 4:
+        print("usage: python -m tabs.pipeline RECIPE INPUT OUTPUT", file=sys.stderr)
+        sys.exit(2)
+    result = replay(*sys.argv[1:])
+    print(f"Wrote {len(result)} rows to {sys.argv[3]}")
@@ -0,0 +1,266 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import cbook
+from matplotlib.lines import Line2D
+from scipy import stats
+from sklearn.linear_model import LinearRegression
+from statsmodels.tsa.seasonal import seasonal_decompose
+from tabs.density import DensityScatter
+from tabs.decimate import DecimatedLine, DECIMATE_POINTS, can_decimate
+
+
+# Fields of the Titles box each plot type shows (all three by default)
+PLOT_LABELS = {
+    "Box Plot": ('title', 'ylabel'),
+    "Heatmap": ('title',),
+    "Time Series Decomposition": (),
+}
+ALL_LABELS = ('title', 'xlabel', 'ylabel')
+
+# Share of the figure taken by a single subplot with the default margins
+AXES_SHARE = (0.775, 0.77)
+
+# Plot inputs kept for re-showing earlier plots
+PLOT_CACHE_BYTES = 256 * 1024 ** 2
+
+
+def numeric_pairs(data, x_col, y_col):
+    x = data[x_col].to_numpy(dtype=float, na_value=np.nan)
+    y = data[y_col].to_numpy(dtype=float, na_value=np.nan)
+    keep = np.isfinite(x) & np.isfinite(y)
+    return x[keep], y[keep]
+
+
+def regression_inputs(data, x_col, y_col):
+    # Least-squares fit with the 95% confidence band of the fitted mean
+    x, y = numeric_pairs(data, x_col, y_col)
+    model = LinearRegression().fit(x.reshape(-1, 1), y)
+    r_sq = model.score(x.reshape(-1, 1), y)
+    grid = np.linspace(x.min(), x.max(), 100)
+    fit = model.predict(grid.reshape(-1, 1))
+    n = len(x)
+    residuals = y - model.predict(x.reshape(-1, 1))
+    spread = np.sqrt((residuals ** 2).sum() / max(n - 2, 1))
+    sxx = ((x - x.mean()) ** 2).sum()
+    half = stats.t.ppf(0.975, max(n - 2, 1)) * spread * np.sqrt(1 / n + (grid - x.mean()) ** 2 / (sxx or 1))
+    equation = f"y = {model.coef_[0]:.4f}x + {model.intercept_:.4f}\nR² = {r_sq:.4f}"
+    return {'x': x, 'y': y, 'grid': grid, 'fit': fit, 'band': (fit - half, fit + half), 'equation': equation}
+
+
+def plot_columns(data, spec):
+    # Columns whose values a plot's inputs are computed from
+    if spec['plot_type'] == "Heatmap":
+        return data.select_dtypes(include=np.number).columns.tolist()
+    if spec['plot_type'] == "Pair Plot":
+        return list(spec['columns'])
+    return list(dict.fromkeys(col for col in (spec['x_col'], spec['y_col']) if col))
+
+
+def prepare_plot(data, spec, size=(1000, 600), column_stats=None):
+    # The heavy part of a plot (binning, decimation, fits, decompositions),
+    # run on a worker thread; render_plot() draws from the returned inputs
+    plot_type, x_col, y_col = spec['plot_type'], spec['x_col'], spec['y_col']
+    width, height = size[0] * AXES_SHARE[0], size[1] * AXES_SHARE[1]
+
+    if plot_type == "Histogram":
+        counts, edges = np.histogram(data[x_col].dropna().to_numpy(dtype=float), bins=10)
+        return {'counts': counts, 'edges': edges}
+
+    if plot_type == "Box Plot":
+        return {'stats': cbook.boxplot_stats(data[x_col].dropna().to_numpy(dtype=float))}
+
+    if plot_type == "Scatter Plot":
+        if spec.get('density'):
+            scatter = DensityScatter(data[x_col], data[y_col])
+            scatter.prepare((width, height))
+            return {'density': scatter}
+        return {'x': data[x_col], 'y': data[y_col]}
+
+    if plot_type == "Line Chart":
+        if spec.get('decimation') and can_decimate(data[x_col], data[y_col]):
+            line = DecimatedLine(data[x_col], data[y_col], spec['decimation'])
+            line.prepare(width)
+            return {'line': line}
+        return {'frame': data[list(dict.fromkeys([x_col, y_col]))]}
+
+    if plot_type == "Bar Chart":
+        return {'counts': data[x_col].value_counts().head(10)}
+
+    if plot_type == "Heatmap":
+        num_cols = data.select_dtypes(include=np.number).columns.tolist()
+        if column_stats is not None:
+            # Shares the per-column correlation cache with the Analysis tab
+            return {'corr': column_stats.corr(data, num_cols)}
+        return {'corr': data[num_cols].corr()}
+
+    if plot_type == "Regression Plot":
+        return regression_inputs(data, x_col, y_col)
+
+    if plot_type == "Time Series Decomposition":
+        # Set datetime index
+        ts_data = data.set_index(x_col)[y_col]
+        ts_data = ts_data.asfreq('D').ffill()  # Handle missing dates
+        decomposition = seasonal_decompose(ts_data, model='additive', period=30)
+        components = []
+        for series in (ts_data, decomposition.trend, decomposition.seasonal, decomposition.resid):
+            if spec.get('decimation') and len(series) > DECIMATE_POINTS:
+                line = DecimatedLine(series.index, series, spec['decimation'])
+                line.prepare(width / 2)
+                components.append(line)
+            else:
+                components.append(series)
+        return {'components': components}
+
+    raise ValueError(f"Unknown plot type: {plot_type}")
+
+
+def render_plot(figure, spec, inputs, color, palette, labels):
+    # Draws prepared inputs into a cleared figure on the main thread. Returns
+    # (label texts by field, artists drawn in `color`, artists using `palette`)
+    plot_type, x_col, y_col = spec['plot_type'], spec['x_col'], spec['y_col']
+    colored = []
+    mapped = []
+
+    if plot_type == "Time Series Decomposition":
+        # Create a 2x2 grid of plots
+        ((ax1, ax2), (ax3, ax4)) = figure.subplots(2, 2)
+        figure.suptitle(f"Time Series Decomposition: {y_col}", fontsize=16)
+
+        # Original series, then the trend, seasonal and residual components
+        for ax, component, component_color, title in zip(
+                (ax1, ax2, ax3, ax4), inputs['components'], (color, 'green', 'purple', 'red'),
+                ('Original Time Series', 'Trend Component', 'Seasonal Component', 'Residual Component')):
+            if isinstance(component, DecimatedLine):
+                component.draw(ax, color=component_color)
+            else:
+                component.plot(ax=ax, color=component_color)
+            ax.set_title(title)
+        ax1.set_ylabel(y_col)
+        colored = list(ax1.get_lines())
+
+        figure.tight_layout()
+        figure.subplots_adjust(top=0.9)
+        return {}, colored, mapped
+
+    ax = figure.add_subplot(111)
+    if plot_type == "Histogram":
+        _, _, patches = ax.hist(inputs['edges'][:-1], bins=inputs['edges'], weights=inputs['counts'], color=color)
+        ax.grid(True)
+        colored = list(patches)
+
+    elif plot_type == "Box Plot":
+        boxes = ax.bxp(inputs['stats'], patch_artist=True, boxprops={'facecolor': color},
+                       medianprops={'color': 'black'})
+        ax.set_xticks([])
+        colored = boxes['boxes']
+
+    elif plot_type == "Scatter Plot":
+        if 'density' in inputs:
+            # One image of binned counts, re-binned when the toolbar zooms
+            image = inputs['density'].draw(ax, cmap=palette)
+            figure.colorbar(image, ax=ax, label="Points per bin")
+            mapped = [image]
+        else:
+            colored = [ax.scatter(inputs['x'], inputs['y'], color=color)]
+
+    elif plot_type == "Line Chart":
+        if 'line' in inputs:
+            colored = [inputs['line'].draw(ax, color=color, label=y_col)]
+            ax.legend()
+        else:
+            inputs['frame'].plot(x=x_col, y=y_col, ax=ax, color=color)
+            colored = list(ax.get_lines())
+        legend = ax.get_legend()
+        if legend is not None:
+            colored += list(legend.legend_handles)
+
+    elif plot_type == "Bar Chart":
+        inputs['counts'].plot(ax=ax, kind='bar', color=color)
+        colored = list(ax.patches)
+
+    elif plot_type == "Heatmap":
+        sns.heatmap(inputs['corr'], annot=True, fmt=".2f", ax=ax, cmap=palette)
+        mapped = list(ax.collections)
+
+    elif plot_type == "Regression Plot":
+        colored = [ax.scatter(inputs['x'], inputs['y'], color=color, alpha=0.5)]
+        ax.plot(inputs['grid'], inputs['fit'], color='red')
+        ax.fill_between(inputs['grid'], *inputs['band'], color='red', alpha=0.15, linewidth=0)
+
+        # Add regression equation
+        ax.text(0.05, 0.95, inputs['equation'], transform=ax.transAxes,
+                fontsize=10, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+    fields = PLOT_LABELS.get(plot_type, ALL_LABELS)
+    texts = {}
+    if 'title' in fields:
+        texts['title'] = ax.set_title(labels['title'])
+    if 'xlabel' in fields:
+        texts['xlabel'] = ax.set_xlabel(labels['xlabel'])
+    if 'ylabel' in fields:
+        texts['ylabel'] = ax.set_ylabel(labels['ylabel'])
+    return texts, colored, mapped
+
+
+def inputs_nbytes(value):
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, dict):
+        return sum(inputs_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(inputs_nbytes(item) for item in value)
+    return int(getattr(value, 'nbytes', 0))
+
+
+class PlotCache:
+    # Least recently used plot inputs, keyed by the plot parameters and the
+    # versions of the columns they were computed from, so a plot is only
+    # recomputed once its data has changed. The oldest entries are dropped
+    # once the stored inputs exceed the budget.
+    def __init__(self, budget_bytes=PLOT_CACHE_BYTES):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+
+    def clear(self):
+        self.entries = OrderedDict()
+
+    @property
+    def nbytes(self):
+        return sum(size for _, size in self.entries.values())
+
+    def key(self, data, spec, column_stats):
+        # Style and the whole-frame version only affect drawing; every
+        # other parameter and the used columns' versions select the inputs
+        params = tuple(sorted((name, value) for name, value in spec.items() if name not in ('style', 'version')))
+        column_stats.attach(data)
+        versions = tuple((col, column_stats.column_versions.get(col)) for col in plot_columns(data, spec))
+        return params, versions
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key, inputs):
+        # Inputs of the same plot over older column versions can never be hit again
+        for stale in [other for other in self.entries if other[0] == key[0] and other != key]:
+            del self.entries[stale]
+        self.entries[key] = (inputs, inputs_nbytes(inputs))
+        self.entries.move_to_end(key)
+        self.evict()
+
+    def evict(self):
+        while len(self.entries) > 1 and self.nbytes > self.budget_bytes:
+            self.entries.popitem(last=False)
+
+
+def recolor(artists, color):
+    for artist in artists:
+        if isinstance(artist, Line2D):
+            artist.set_color(color)
+        else:
+            artist.set_facecolor(color)
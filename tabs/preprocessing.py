@@ -1,11 +1,17 @@
-import pandas as pd
-import numpy as np
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from tabs.pipeline import Pipeline, describe_step, replay
+from tabs.filters import FilterBuilder
+from tabs.impute import ImputeDialog
+from tabs.dedup import DuplicateReport
 
 class PreprocessingManager:
     def __init__(self, app):
         self.app = app
+        # Steps already applied to the current data, and steps deferred until "Run Pipeline"
+        self.pipeline = Pipeline()
+        self.pending = Pipeline()
+        self.last_report = []
     
     def setup_ui(self, parent):
         # Header
@@ -32,10 +38,15 @@ class PreprocessingManager:
                         variable=self.missing_var, value="median").pack(anchor=tk.W)
         ttk.Radiobutton(missing_frame, text="Fill with mode", 
                         variable=self.missing_var, value="mode").pack(anchor=tk.W)
+        self.approx_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(missing_frame, text="Approximate median/mode in one streaming pass (t-digest / heavy hitters)", 
+                        variable=self.approx_var).pack(anchor=tk.W, padx=20)
         ttk.Radiobutton(missing_frame, text="Fill with specific value:", 
                         variable=self.missing_var, value="custom").pack(side=tk.LEFT, anchor=tk.W)
         self.custom_val = ttk.Entry(missing_frame, width=10)
         self.custom_val.pack(side=tk.LEFT, padx=5)
+        self.impute_btn = ttk.Button(missing_frame, text="Per-Column Strategies...", command=self.open_impute, state='disabled')
+        self.impute_btn.pack(side=tk.LEFT, padx=20)
         
         # Data filtering
         filter_frame = ttk.LabelFrame(options_frame, text="Data Filtering")
@@ -57,6 +68,14 @@ class PreprocessingManager:
         self.apply_filter_btn = ttk.Button(filter_frame, text="Apply Filter", command=self.apply_filter, state='disabled')
         self.apply_filter_btn.grid(row=0, column=6, padx=5)
         
+        self.filter_builder_btn = ttk.Button(filter_frame, text="Filter Builder...", command=self.open_filter_builder, state='disabled')
+        self.filter_builder_btn.grid(row=0, column=7, padx=5)
+        
+        # Sorted/bitmap indexes make repeated filters on the same columns a lookup instead of a scan
+        self.use_index = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="Index filtered columns", variable=self.use_index,
+                        command=self.toggle_indexes).grid(row=1, column=0, columnspan=3, padx=5, sticky=tk.W)
+        
         # Data type conversion
         type_frame = ttk.LabelFrame(options_frame, text="Data Type Conversion")
         type_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -73,21 +92,58 @@ class PreprocessingManager:
         self.convert_btn = ttk.Button(type_frame, text="Convert", command=self.convert_type, state='disabled')
         self.convert_btn.grid(row=0, column=4, padx=5)
         
+        self.convert_many_btn = ttk.Button(type_frame, text="Convert Several...", command=self.convert_several, state='disabled')
+        self.convert_many_btn.grid(row=0, column=5, padx=5)
+        
+        # Duplicate rows
+        dup_frame = ttk.LabelFrame(options_frame, text="Duplicates")
+        dup_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.find_dups_btn = ttk.Button(dup_frame, text="Find Duplicates...", command=self.find_duplicates, state='disabled')
+        self.find_dups_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        self.near_dups = tk.BooleanVar(value=False)
+        ttk.Checkbutton(dup_frame, text="Near-duplicates (ignore case, punctuation and spacing)", 
+                        variable=self.near_dups).pack(side=tk.LEFT, padx=5)
+        
         # Apply preprocessing
         apply_frame = ttk.Frame(parent)
         apply_frame.pack(fill=tk.X, padx=10, pady=10)
         self.apply_preprocess_btn = ttk.Button(apply_frame, text="Apply Preprocessing", command=self.apply_preprocessing, state='disabled')
         self.apply_preprocess_btn.pack()
+        
+        # Pipeline / recipe
+        pipeline_frame = ttk.LabelFrame(parent, text="Pipeline")
+        pipeline_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.lazy_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(pipeline_frame, text="Defer steps until Run Pipeline", 
+                        variable=self.lazy_var).pack(anchor=tk.W, padx=5, pady=2)
+        self.pipeline_list = tk.Listbox(pipeline_frame, height=6)
+        self.pipeline_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        
+        pipeline_btns = ttk.Frame(pipeline_frame)
+        pipeline_btns.pack(fill=tk.X, padx=5, pady=5)
+        self.run_pipeline_btn = ttk.Button(pipeline_btns, text="Run Pipeline", command=self.run_pipeline, state='disabled')
+        self.run_pipeline_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Button(pipeline_btns, text="Clear Pending", command=self.clear_pending).pack(side=tk.LEFT, padx=5)
+        ttk.Button(pipeline_btns, text="Save Recipe", command=self.save_recipe).pack(side=tk.LEFT, padx=5)
+        ttk.Button(pipeline_btns, text="Load Recipe", command=self.load_recipe).pack(side=tk.LEFT, padx=5)
+        ttk.Button(pipeline_btns, text="Replay Recipe on File...", command=self.replay_recipe).pack(side=tk.LEFT, padx=5)
     
     def enable_controls(self):
         self.apply_preprocess_btn.config(state=tk.NORMAL)
+        self.impute_btn.config(state=tk.NORMAL)
+        self.find_dups_btn.config(state=tk.NORMAL)
         self.filter_col.config(state='readonly')
         self.filter_cond.config(state='readonly')
         self.filter_val.config(state='normal')
         self.type_col.config(state='readonly')
         self.type_target.config(state='readonly')
         self.apply_filter_btn.config(state=tk.NORMAL)
+        self.filter_builder_btn.config(state=tk.NORMAL)
         self.convert_btn.config(state=tk.NORMAL)
+        self.convert_many_btn.config(state=tk.NORMAL)
+        self.run_pipeline_btn.config(state=tk.NORMAL)
     
     def update_column_comboboxes(self):
         data = self.app.get_data()
@@ -100,6 +156,174 @@ class PreprocessingManager:
                 self.filter_col.set(columns[0])
                 self.type_col.set(columns[0])
     
+    def reset_pipeline(self):
+        # Called when a new dataset is loaded
+        self.pipeline.clear()
+        self.pending.clear()
+        self.refresh_pipeline_list()
+    
+    def refresh_pipeline_list(self):
+        self.pipeline_list.delete(0, tk.END)
+        for step in self.pipeline.steps:
+            self.pipeline_list.insert(tk.END, f"✔ {describe_step(step)}")
+        for step in self.pending.steps:
+            self.pipeline_list.insert(tk.END, f"… {describe_step(step)}")
+    
+    def record_step(self, step, then=None):
+        return self.record_steps([step], describe_step(step), then)
+    
+    def record_steps(self, steps, label, then=None):
+        # Returns False when the steps were deferred to Run Pipeline; otherwise
+        # they run in the background and then() is called once they are applied
+        data_manager = self.app.data_manager
+        if data_manager.source is None and self.lazy_var.get():
+            self.pending.steps.extend(steps)
+            data_manager.info_label.config(text=f"{len(self.pending)} step(s) pending, click Run Pipeline to apply")
+            self.refresh_pipeline_list()
+            return False
+        return self.submit_steps(steps, label, then) is not None
+    
+    def submit_steps(self, steps, label, then=None):
+        # The heavy part runs on a worker; the data is swapped on the mainloop
+        data_manager = self.app.data_manager
+        source = data_manager.source
+        if source is not None:
+            def work(task):
+                # The preview and row count are full reads too, so they run here as well
+                added = [(describe_step(step), self.streamed_step(source, step)) for step in steps]
+                task.check()
+                preview = source.preview(source.steps + added)
+                task.check()
+                return added, preview, source.row_count(source.steps + added)
+            
+            def done(result):
+                added, preview, rows = result
+                for description, func in added:
+                    source.add_step(description, func)
+                source.rows = rows
+                data_manager.refresh_source(preview)
+                self.steps_applied(steps, then)
+        else:
+            data = data_manager.data
+            runner = Pipeline(steps)
+            
+            data_manager.read_history_budget()
+            
+            def work(task):
+                result = runner.run(data, data_manager.indexes, data_manager.stats)
+                return result, data_manager.prepare_change(data, result, label, steps)
+            
+            def done(result):
+                data_manager.commit_change(data, *result)
+                self.last_report = runner.report
+                self.steps_applied(steps, then)
+        return self.app.run_task(f"Applying {label}", work, done, channel='data')
+    
+    def steps_applied(self, steps, then=None):
+        self.pipeline.steps.extend(steps)
+        self.refresh_pipeline_list()
+        self.app.update_data_display()
+        if then is not None:
+            then()
+    
+    def streamed_step(self, source, step):
+        # Out-of-core: fill values come from one streaming pass, then every
+        # step is replayed on each chunk as it is read; returns the chunk function
+        if step['op'] == 'impute':
+            # Group statistics and forward fills need every row at once
+            raise ValueError("Per-column imputation needs the data loaded in memory")
+        if step['op'] == 'dedup':
+            raise ValueError("Duplicate removal needs the data loaded in memory")
+        if step['op'] == 'fill' and step['method'] != 'custom':
+            values = source.fill_values(step['method'], step.get('approximate', False))
+            return lambda chunk: chunk.fillna(values)
+        return Pipeline([step]).run
+    
+    def toggle_indexes(self):
+        indexes = self.app.data_manager.indexes
+        indexes.enabled = self.use_index.get()
+        if not indexes.enabled:
+            indexes.clear()  # free the memory held by the indexes
+    
+    def on_history_step(self, steps, undo):
+        # Keep the recorded recipe in step with undo/redo of the data
+        if undo:
+            del self.pipeline.steps[len(self.pipeline.steps) - len(steps):]
+        else:
+            self.pipeline.steps.extend(steps)
+        self.refresh_pipeline_list()
+    
+    def run_pipeline(self):
+        data_manager = self.app.data_manager
+        if not len(self.pending) or data_manager.data is None:
+            return
+        steps = list(self.pending.steps)
+        
+        def done():
+            self.pending.clear()
+            self.refresh_pipeline_list()
+            self.app.update_column_comboboxes()
+            data_manager.info_label.config(text=f"Pipeline ran {len(steps)} step(s): {self.row_count_text()}")
+        
+        self.submit_steps(steps, f"pipeline of {len(steps)} step(s)", done)
+    
+    def clear_pending(self):
+        self.pending.clear()
+        self.refresh_pipeline_list()
+    
+    def save_recipe(self):
+        recipe = Pipeline(self.pipeline.steps + self.pending.steps)
+        if not len(recipe):
+            messagebox.showwarning("Warning", "No preprocessing steps to save")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=[("Recipe files", "*.json"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            recipe.save(file_path)
+            messagebox.showinfo("Success", f"Recipe saved to:\n{file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save recipe:\n{str(e)}")
+    
+    def load_recipe(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Recipe files", "*.json"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            recipe = Pipeline.load(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load recipe:\n{str(e)}")
+            return
+        # Loaded steps are queued; Run Pipeline applies them to the current data
+        self.pending = recipe
+        self.refresh_pipeline_list()
+    
+    def replay_recipe(self):
+        recipe_path = filedialog.askopenfilename(
+            title="Recipe", filetypes=[("Recipe files", "*.json"), ("All files", "*.*")])
+        if not recipe_path:
+            return
+        input_path = filedialog.askopenfilename(
+            title="Input data", filetypes=[("Data files", "*.csv *.xlsx *.xls *.json *.jsonl *.ndjson"), ("All files", "*.*")])
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(title="Output data", defaultextension=".csv",
+                                                   filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet")])
+        if not output_path:
+            return
+        # Reads, runs and writes the whole file, so it runs in the background
+        self.app.run_task("Replaying recipe", lambda task: len(replay(recipe_path, input_path, output_path)),
+                          lambda rows: messagebox.showinfo("Success", f"Recipe applied: {rows} rows written to:\n{output_path}"),
+                          on_error=lambda e: messagebox.showerror("Error", f"Failed to replay recipe:\n{str(e)}"),
+                          channel='data')
+    
+    def row_count_text(self):
+        source = self.app.data_manager.source
+        if source is not None:
+            return f"{source.rows if source.rows is not None else '?'} rows (streamed)"
+        return f"{self.app.get_data().shape[0]} rows"
+    
     def apply_filter(self):
         data = self.app.get_data()
         col = self.filter_col.get()
@@ -116,37 +340,68 @@ class PreprocessingManager:
                 val = float(val)
             except ValueError:
                 pass  # Keep as string if conversion fails
-                
-            # Create filter expression
-            expr = f"`{col}` {cond} {repr(val)}"
-            self.app.data_manager.data = data.query(expr)
-            self.app.update_data_display()
-            self.app.data_manager.info_label.config(text=f"Filter applied: {self.app.get_data().shape[0]} rows remaining")
+            
+            step = {'op': 'filter', 'column': col, 'cond': cond, 'value': val}
+            Pipeline([step]).run(data.head(0))  # validate before recording
+            self.record_step(step, lambda: self.app.data_manager.info_label.config(
+                text=f"Filter applied: {self.row_count_text()} remaining{self.index_text()}"))
         except Exception as e:
             messagebox.showerror("Error", f"Invalid filter expression:\n{str(e)}")
     
-    def convert_type(self):
+    def index_text(self):
+        indexes = self.app.data_manager.indexes
+        if not indexes.enabled:
+            return ""
+        return f" (indexed: {indexes.summary()})"
+    
+    def open_filter_builder(self):
+        # Compound conditions (AND/OR groups, in, between, nulls, contains) run as one mask
         data = self.app.get_data()
+        if data is None:
+            return
+        where = FilterBuilder(self.app.root, list(data.columns)).show()
+        if where is None:
+            return
+        
+        try:
+            step = {'op': 'where', 'where': where}
+            Pipeline([step]).run(data.head(0))  # validate before recording
+            self.record_step(step, lambda: self.app.data_manager.info_label.config(
+                text=f"Filter applied: {self.row_count_text()} remaining"))
+        except Exception as e:
+            messagebox.showerror("Error", f"Invalid filter expression:\n{str(e)}")
+    
+    def convert_type(self):
         col = self.type_col.get()
         target_type = self.type_target.get()
         
         if not col or not target_type:
             return
         
-        try:
-            if target_type == "numeric":
-                data[col] = pd.to_numeric(data[col], errors='coerce')
-            elif target_type == "string":
-                data[col] = data[col].astype(str)
-            elif target_type == "datetime":
-                data[col] = pd.to_datetime(data[col], errors='coerce')
-            elif target_type == "category":
-                data[col] = data[col].astype('category')
-            
-            self.app.update_data_display()
-            messagebox.showinfo("Success", f"Column '{col}' converted to {target_type}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Conversion failed:\n{str(e)}")
+        self.record_step({'op': 'convert', 'column': col, 'target': target_type},
+                         lambda: messagebox.showinfo("Success", f"Column '{col}' converted to {target_type}"))
+    
+    def convert_several(self):
+        # Adjacent conversions run as one batch, different columns in parallel
+        data = self.app.get_data()
+        target_type = self.type_target.get()
+        if data is None:
+            return
+        if not target_type:
+            messagebox.showwarning("Warning", "Choose a type to convert to")
+            return
+        columns = self.app.data_manager.ask_columns(f"Convert columns to {target_type}", list(data.columns),
+                                                    select_all=False, action="Convert")
+        if not columns:
+            return
+        
+        steps = [{'op': 'convert', 'column': col, 'target': target_type} for col in columns]
+        
+        def done():
+            self.app.update_column_comboboxes()
+            messagebox.showinfo("Success", f"{len(columns)} column(s) converted to {target_type}")
+        
+        self.record_steps(steps, f"convert {len(columns)} columns to {target_type}", done)
     
     def apply_preprocessing(self):
         data = self.app.get_data()
@@ -156,20 +411,123 @@ class PreprocessingManager:
         # Handle missing values
         method = self.missing_var.get()
         if method == "drop":
-            self.app.data_manager.data = data.dropna()
-        elif method == "mean":
-            self.app.data_manager.data = data.fillna(data.mean(numeric_only=True))
-        elif method == "median":
-            self.app.data_manager.data = data.fillna(data.median(numeric_only=True))
-        elif method == "mode":
-            self.app.data_manager.data = data.fillna(data.mode().iloc[0])
+            step = {'op': 'dropna'}
         elif method == "custom":
             try:
                 val = float(self.custom_val.get()) if self.custom_val.get() else 0
-                self.app.data_manager.data = data.fillna(val)
             except ValueError:
                 messagebox.showerror("Error", "Invalid custom value for missing data")
                 return
+            step = {'op': 'fill', 'method': 'custom', 'value': val}
+        else:
+            step = {'op': 'fill', 'method': method}
+            if method in ("median", "mode") and self.approx_var.get():
+                step['approximate'] = True
         
-        self.app.update_data_display()
-        self.app.data_manager.info_label.config(text=f"Preprocessing applied: {self.app.get_data().shape[0]} rows")
\ No newline at end of file
+        data_manager = self.app.data_manager
+        
+        def done(bounds=None):
+            data_manager.info_label.config(text=f"Preprocessing applied: {self.row_count_text()}")
+            if step.get('approximate'):
+                self.show_fill_bounds(method, bounds if bounds is not None else data_manager.source.fill_bounds)
+        
+        if step.get('approximate') and data_manager.source is None and not self.lazy_var.get():
+            # Computed (and cached) before the fill so the bounds describe the original values
+            self.app.run_task("Sketching fill values", lambda task: data_manager.stats.fill_bounds(data, method),
+                              lambda bounds: self.record_step(step, lambda: done(bounds)), channel='data')
+            return
+        self.record_step(step, done)
+    
+    def open_impute(self):
+        data = self.app.get_data()
+        if data is None:
+            return
+        if self.app.data_manager.source is not None:
+            messagebox.showwarning("Warning", "Per-column imputation needs the data loaded in memory")
+            return
+        strategies = ImputeDialog(self.app.root, data).show()
+        if strategies is None:
+            return
+        
+        def done():
+            filled = sum(row[2] for row in self.last_report if row[2] is not None)
+            self.app.data_manager.info_label.config(
+                text=f"Imputed {filled:,} values in {len(strategies)} column(s): {self.row_count_text()}")
+            self.show_impute_report(self.last_report)
+        
+        self.record_step({'op': 'impute', 'strategies': strategies}, done)
+    
+    def show_impute_report(self, report):
+        window = tk.Toplevel(self.app.root)
+        window.title("Imputation Report")
+        tree = ttk.Treeview(window, columns=('column', 'strategy', 'filled', 'seconds'), show='headings', height=15)
+        for col, text, width in [('column', "Columns", 200), ('strategy', "Strategy", 160),
+                                 ('filled', "Filled", 100), ('seconds', "Seconds", 80)]:
+            tree.heading(col, text=text)
+            tree.column(col, width=width, anchor=tk.E if col in ('filled', 'seconds') else tk.W)
+        for columns, strategy, filled, seconds in report:
+            tree.insert('', tk.END, values=(columns, strategy, "" if filled is None else f"{filled:,}", f"{seconds:.3f}"))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        total = sum(row[3] for row in report)
+        filled = sum(row[2] for row in report if row[2] is not None)
+        ttk.Label(window, text=f"{filled:,} values filled in {total:.2f}s").pack(padx=10, pady=(0, 10))
+    
+    def find_duplicates(self):
+        data = self.app.get_data()
+        if data is None:
+            return
+        if self.app.data_manager.source is not None:
+            messagebox.showwarning("Warning", "Duplicate removal needs the data loaded in memory")
+            return
+        columns = self.app.data_manager.ask_columns("Key columns for duplicates", list(data.columns), action="Find")
+        if not columns:
+            return
+        if len(columns) == len(data.columns):
+            columns = None
+        
+        normalize = self.near_dups.get()
+        self.app.run_task("Finding duplicates", lambda task: DuplicateReport(data, columns, normalize),
+                          lambda report: self.show_duplicates(data, report),
+                          on_error=lambda e: messagebox.showerror("Error", f"Duplicate search failed:\n{str(e)}"),
+                          channel='data')
+    
+    def show_duplicates(self, data, report):
+        # Counts and the largest groups are shown before anything is removed
+        window = tk.Toplevel(self.app.root)
+        window.title("Duplicate Rows")
+        ttk.Label(window, text=report.summary()).pack(anchor=tk.W, padx=10, pady=(10, 0))
+        
+        tree = ttk.Treeview(window, columns=['rows'] + report.columns, show='headings', height=15)
+        tree.heading('rows', text="Rows")
+        tree.column('rows', width=60, anchor=tk.E)
+        for col in report.columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=120)
+        for count, keys in report.groups(data):
+            tree.insert('', tk.END, values=[f"{count:,}"] + [str(key) for key in keys])
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        if report.group_count > 100:
+            ttk.Label(window, text=f"Showing the 100 largest of {report.group_count:,} groups").pack(anchor=tk.W, padx=10)
+        
+        def remove():
+            window.destroy()
+            step = {'op': 'dedup', 'columns': None if len(report.columns) == len(data.columns) else report.columns,
+                    'normalize': report.normalize}
+            self.record_step(step, lambda: self.app.data_manager.info_label.config(
+                text=f"Removed {report.duplicate_count:,} duplicate rows: {self.row_count_text()}"))
+        
+        btn_frame = ttk.Frame(window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Close", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        remove_btn = ttk.Button(btn_frame, text="Remove Duplicates", command=remove)
+        remove_btn.pack(side=tk.RIGHT, padx=5)
+        if not report.duplicate_count:
+            remove_btn.config(state='disabled')
+    
+    def show_fill_bounds(self, method, bounds):
+        if not bounds:
+            return
+        lines = [f"{col}: {bound}" for col, bound in list(bounds.items())[:15]]
+        if len(bounds) > 15:
+            lines.append(f"... and {len(bounds) - 15} more columns")
+        messagebox.showinfo("Approximate Fill", f"Approximate {method} error bounds:\n\n" + "\n".join(lines))
\ No newline at end of file
@@ -0,0 +1,136 @@
+import random
+import tkinter as tk
+from tkinter import ttk, messagebox
+import pandas as pd
+
+
+DTYPE_CHOICES = ["auto", "int64", "Int64", "float64", "float32", "string", "category", "bool", "datetime"]
+
+
+def sniff_csv(file_path, nrows=1000):
+    sample = pd.read_csv(file_path, nrows=nrows)
+    return [(col, str(dtype)) for col, dtype in sample.dtypes.items()]
+
+
+def build_read_options(usecols=None, overrides=None, row_limit=None, sample_fraction=1.0, seed=0):
+    # Returns read_csv keyword arguments plus a cache variant describing them
+    overrides = {col: dtype for col, dtype in (overrides or {}).items() if dtype != "auto"}
+    kwargs = {}
+    if usecols is not None:
+        kwargs['usecols'] = list(usecols)
+    dtype = {col: t for col, t in overrides.items() if t != "datetime"}
+    if dtype:
+        kwargs['dtype'] = dtype
+    parse_dates = [col for col, t in overrides.items() if t == "datetime"]
+    if parse_dates:
+        kwargs['parse_dates'] = parse_dates
+    if row_limit:
+        kwargs['nrows'] = row_limit
+    if sample_fraction < 1:
+        # Skipped rows are never converted, which is where the parse time goes
+        rng = random.Random(seed)
+        kwargs['skiprows'] = lambda i: i > 0 and rng.random() >= sample_fraction
+
+    variant = f"usecols={usecols}|dtype={sorted(overrides.items())}|nrows={row_limit}|sample={sample_fraction}:{seed}"
+    return kwargs, variant
+
+
+class SchemaDialog:
+    # Pre-load dialog: shows the sniffed schema and lets the user choose
+    # columns, dtype overrides and a row limit or sample before the full read
+    def __init__(self, root, file_path, schema):
+        self.result = None
+        self.schema = schema
+        self.include = {col: True for col, _ in schema}
+        self.overrides = {col: "auto" for col, _ in schema}
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Load Options: Columns and Types")
+        self.window.transient(root)
+
+        ttk.Label(self.window, text=f"{len(schema)} columns sniffed from {file_path}").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        ttk.Label(self.window, text="Double-click a row to include or exclude it").pack(anchor=tk.W, padx=10)
+
+        self.tree = ttk.Treeview(self.window, columns=('load', 'name', 'inferred', 'override'),
+                                 show='headings', height=15, selectmode='extended')
+        for col, text, width in [('load', "Load", 50), ('name', "Column", 220),
+                                 ('inferred', "Inferred", 100), ('override', "Load as", 100)]:
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width)
+        for col, dtype in schema:
+            self.tree.insert('', tk.END, iid=col, values=self.row_values(col, dtype))
+        self.tree.bind('<Double-1>', self.toggle_selected)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        type_frame = ttk.Frame(self.window)
+        type_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(type_frame, text="Include All", command=lambda: self.set_all(True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(type_frame, text="Exclude All", command=lambda: self.set_all(False)).pack(side=tk.LEFT, padx=5)
+        ttk.Label(type_frame, text="Load selected as:").pack(side=tk.LEFT, padx=(20, 5))
+        self.type_choice = ttk.Combobox(type_frame, values=DTYPE_CHOICES, state='readonly', width=10)
+        self.type_choice.set("auto")
+        self.type_choice.pack(side=tk.LEFT, padx=5)
+        ttk.Button(type_frame, text="Set", command=self.set_override).pack(side=tk.LEFT, padx=5)
+
+        rows_frame = ttk.Frame(self.window)
+        rows_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(rows_frame, text="Row limit:").pack(side=tk.LEFT)
+        self.row_limit = ttk.Entry(rows_frame, width=12)
+        self.row_limit.pack(side=tk.LEFT, padx=5)
+        ttk.Label(rows_frame, text="Sample fraction (0-1]:").pack(side=tk.LEFT, padx=(20, 0))
+        self.sample_fraction = ttk.Entry(rows_frame, width=8)
+        self.sample_fraction.insert(0, "1.0")
+        self.sample_fraction.pack(side=tk.LEFT, padx=5)
+
+        btn_frame = ttk.Frame(self.window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="Cancel", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="Load", command=self.accept).pack(side=tk.RIGHT, padx=5)
+
+    def row_values(self, col, inferred):
+        return ("✔" if self.include[col] else "", col, inferred, self.overrides[col])
+
+    def refresh_row(self, col):
+        inferred = dict(self.schema)[col]
+        self.tree.item(col, values=self.row_values(col, inferred))
+
+    def toggle_selected(self, event=None):
+        for col in self.tree.selection():
+            self.include[col] = not self.include[col]
+            self.refresh_row(col)
+
+    def set_all(self, include):
+        for col, _ in self.schema:
+            self.include[col] = include
+            self.refresh_row(col)
+
+    def set_override(self):
+        for col in self.tree.selection():
+            self.overrides[col] = self.type_choice.get()
+            self.refresh_row(col)
+
+    def accept(self):
+        usecols = [col for col, _ in self.schema if self.include[col]]
+        if not usecols:
+            messagebox.showwarning("Warning", "Select at least one column to load", parent=self.window)
+            return
+        try:
+            row_limit = int(self.row_limit.get()) if self.row_limit.get().strip() else None
+            fraction = float(self.sample_fraction.get()) if self.sample_fraction.get().strip() else 1.0
+            if not 0 < fraction <= 1 or (row_limit is not None and row_limit <= 0):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Row limit must be a positive integer and sample fraction in (0, 1]",
+                                 parent=self.window)
+            return
+
+        if len(usecols) == len(self.schema):
+            usecols = None
+        overrides = {col: t for col, t in self.overrides.items() if self.include[col]}
+        self.result = build_read_options(usecols, overrides, row_limit, fraction)
+        self.window.destroy()
+
+    def show(self):
+        self.window.grab_set()
+        self.window.wait_window()
+        return self.result
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+
+SKETCH_CHUNK_ROWS = 200000
+
+
+class TDigest:
+    # Merging t-digest: values are kept as weighted centroids that are small
+    # near the tails and larger in the middle, so quantiles come from a few
+    # hundred numbers whatever the row count
+    def __init__(self, compression=500):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return self.weights.sum()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        means = np.concatenate([self.means, values])
+        weights = np.concatenate([self.weights, np.ones(len(values))])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        # Centroids may only span one unit of the k1 scale function
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1)))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        if not len(self.weights):
+            return np.nan
+        total = self.weights.sum()
+        centres = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * total, np.r_[0, centres, total], np.r_[self.min, self.means, self.max]))
+
+    def rank_error(self, q):
+        # Half the weight of the centroid holding q, as a fraction of all rows
+        if not len(self.weights):
+            return 0.0
+        total = self.weights.sum()
+        i = min(np.searchsorted(np.cumsum(self.weights), q * total), len(self.weights) - 1)
+        return float(self.weights[i] / 2 / total)
+
+    def bounds(self, q):
+        error = self.rank_error(q)
+        return self.quantile(max(q - error, 0)), self.quantile(min(q + error, 1)), error
+
+
+class SpaceSaving:
+    # Mergeable heavy-hitter summary: at most capacity counters, each an upper
+    # bound on its item's frequency with a known maximum overcount. Items not
+    # tracked occur at most floor times.
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=float)
+        self.errors = pd.Series(dtype=float)
+        self.floor = 0
+        self.total = 0
+
+    def update(self, series):
+        counts = series.value_counts()
+        self.total += int(counts.sum())
+        floor = 0
+        if len(counts) > self.capacity:
+            floor = counts.iloc[self.capacity]
+            counts = counts.iloc[:self.capacity]
+
+        index = self.counts.index.union(counts.index)
+        merged = self.counts.reindex(index, fill_value=self.floor) + counts.reindex(index, fill_value=floor)
+        errors = (self.errors.reindex(index, fill_value=self.floor)
+                  + pd.Series(0, index=counts.index).reindex(index, fill_value=floor))
+        self.floor += floor
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False, kind='stable')
+            self.floor = max(self.floor, merged.iloc[self.capacity])
+            merged = merged.iloc[:self.capacity]
+        self.counts = merged
+        self.errors = errors.reindex(merged.index)
+
+    def mode(self):
+        # Returns (value, count upper bound, maximum overcount)
+        if self.counts.empty:
+            return np.nan, 0, 0
+        value = self.counts.idxmax()
+        return value, int(self.counts[value]), int(self.errors[value])
+
+
+def iter_column_chunks(series, chunk_size=SKETCH_CHUNK_ROWS):
+    for start in range(0, len(series), chunk_size):
+        yield series.iloc[start:start + chunk_size]
+
+
+def describe_median_bound(digest):
+    low, high, error = digest.bounds(0.5)
+    return f"±{error:.2%} rank, within [{low:.6g}, {high:.6g}]"
+
+
+def describe_mode_bound(summary):
+    _, count, error = summary.mode()
+    if error == 0 and summary.floor == 0:
+        return f"exact, {count:,} of {summary.total:,}"
+    return f"{count - error:,}-{count:,} of {summary.total:,}"
+
+
+class FillSketch:
+    # One chunked pass feeding a t-digest (median) or space-saving summary
+    # (mode) per column; memory stays fixed however many rows go through
+    def __init__(self, method):
+        if method not in ("median", "mode"):
+            raise ValueError(f"No approximate fill for: {method}")
+        self.method = method
+        self.sketches = {}
+
+    def update(self, chunk):
+        for col in chunk.columns:
+            series = chunk[col]
+            if self.method == "median":
+                if not pd.api.types.is_numeric_dtype(series.dtype):
+                    continue
+                sketch = self.sketches.setdefault(col, TDigest())
+                sketch.update(series.to_numpy(dtype=float, na_value=np.nan))
+            else:
+                self.sketches.setdefault(col, SpaceSaving()).update(series)
+
+    def result(self):
+        # Returns ({column: fill value}, {column: error bound text})
+        values = {}
+        bounds = {}
+        for col, sketch in self.sketches.items():
+            if self.method == "median":
+                value, bound = sketch.quantile(0.5), describe_median_bound(sketch)
+            else:
+                value, bound = sketch.mode()[0], describe_mode_bound(sketch)
+            if not pd.isna(value):
+                values[col] = value
+                bounds[col] = bound
+        return values, bounds
+
+
+def approximate_column(series, method):
+    # Returns (fill value, error bound text) for a single column
+    sketch = FillSketch(method)
+    for chunk in iter_column_chunks(series):
+        sketch.update(chunk.to_frame())
+    values, bounds = sketch.result()
+    return values.get(series.name, np.nan), bounds.get(series.name)
+
+
+def approximate_fill_values(chunks, method):
+    sketch = FillSketch(method)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch.result()
@@ -0,0 +1,202 @@
+import threading
+import numpy as np
+import pandas as pd
+from tabs.sketches import approximate_column
+
+
+COLUMN_OPS = ('convert', 'fill', 'impute')
+
+
+def is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series.dtype)
+
+
+def column_mode(series):
+    modes = series.mode()
+    return modes.iloc[0] if len(modes) else np.nan
+
+
+class ColumnStats:
+    # Per-column statistics for the current frame. Every change bumps the data
+    # version; only the columns it touched are stamped with the new version
+    # and dropped from the cache, so unchanged columns are never rescanned.
+    # Task threads read and fill the cache while steps replace the frame, so
+    # the cache is guarded by a lock and a value is only stored if its column
+    # was not changed while it was being computed.
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.frame = None
+        self.version = 0
+        self.column_versions = {}
+        self.entries = {}
+        self.pairs = {}
+
+    def attach(self, data):
+        # Any frame not reached through track() starts a fresh cache
+        with self.lock:
+            if data is not self.frame:
+                self.version += 1
+                self.frame = data
+                self.column_versions = {col: self.version for col in data.columns}
+                self.entries = {}
+                self.pairs = {}
+
+    def invalidate(self, columns):
+        # Called with the lock held
+        for col in columns:
+            self.column_versions[col] = self.version
+            self.entries.pop(col, None)
+        self.pairs = {pair: value for pair, value in self.pairs.items()
+                      if pair[0] not in columns and pair[1] not in columns}
+
+    def track(self, before, after, steps=None):
+        self.commit(before, after, self.changes(before, after, steps))
+
+    def changes(self, before, after, steps=None):
+        # Work out which columns changed between two frames; None when the
+        # rows changed, so every statistic did. Only reads the frames, so it
+        # can run on a worker ahead of commit().
+        if after is before or before is None:
+            return set()
+        if len(before) != len(after) or not before.index.equals(after.index):
+            return None
+
+        changed = {col for col in after.columns
+                   if col not in before.columns or before[col].dtype != after[col].dtype}
+        changed |= set(before.columns) - set(after.columns)
+        if steps and all(step['op'] in COLUMN_OPS for step in steps):
+            for step in steps:
+                if step['op'] == 'convert':
+                    changed.add(step['column'])
+                elif step['op'] == 'impute':
+                    changed |= set(step['strategies'])
+                else:
+                    # A fill only touches columns whose missing values changed;
+                    # counted on both frames, as on undo `before` is the filled one
+                    changed |= {col for col in before.columns if col in after.columns
+                                and (before[col].hasnans or after[col].hasnans)
+                                and before[col].isna().sum() != after[col].isna().sum()}
+        else:
+            changed |= {col for col in after.columns if col in before.columns and col not in changed
+                        and not before[col].equals(after[col])}
+        return changed
+
+    def commit(self, before, after, changed):
+        # Moves the cache from before to after, dropping the changed columns
+        if after is before:
+            return
+        with self.lock:
+            if self.frame is not before or before is None:
+                self.attach(after)
+                return
+            self.version += 1
+            self.frame = after
+            if changed is None:
+                self.column_versions = {col: self.version for col in after.columns}
+                self.entries = {}
+                self.pairs = {}
+            else:
+                self.invalidate(changed)
+
+    def get(self, data, col, name):
+        # Only the tracked frame is cached; other frames (e.g. the one a
+        # task started on before a step replaced it) are computed directly
+        with self.lock:
+            if data is not self.frame:
+                return self.compute(data[col], name, {})
+            entry = dict(self.entries.get(col, {}))
+            version = self.column_versions.get(col)
+        if name in entry:
+            return entry[name]
+        value = self.compute(data[col], name, entry)
+        with self.lock:
+            if data is self.frame and self.column_versions.get(col) == version:
+                self.entries.setdefault(col, {})[name] = value
+        return value
+
+    def compute(self, series, name, entry):
+        if name == 'nulls':
+            return int(series.isna().sum())
+        if name == 'describe':
+            return series.describe()
+        # Reuse a cached describe() for the moments it already holds
+        summary = entry.get('describe')
+        if name == 'mean':
+            if summary is not None and 'mean' in summary.index and is_numeric(series):
+                return summary['mean']
+            return series.mean()
+        if name == 'median':
+            if summary is not None and '50%' in summary.index and is_numeric(series):
+                return summary['50%']
+            return series.median()
+        if name == 'mode':
+            return column_mode(series)
+        if name in ('approx_median', 'approx_mode'):
+            return approximate_column(series, name[len('approx_'):])
+        raise ValueError(f"Unknown statistic: {name}")
+
+    def fill_columns(self, data, method):
+        if method in ("mean", "median"):
+            columns = [col for col in data.columns if is_numeric(data[col])]
+        else:
+            columns = list(data.columns)
+        # Columns with nothing to fill need no statistic
+        return [col for col in columns if self.get(data, col, 'nulls') > 0]
+
+    def fill_values(self, data, method, approximate=False):
+        values = {}
+        for col in self.fill_columns(data, method):
+            if approximate:
+                val = self.get(data, col, 'approx_' + method)[0]
+            else:
+                val = self.get(data, col, method)
+            if not pd.isna(val):
+                values[col] = val
+        return values
+
+    def fill_bounds(self, data, method):
+        # Error bound text of each approximate fill value
+        bounds = {}
+        for col in self.fill_columns(data, method):
+            val, bound = self.get(data, col, 'approx_' + method)
+            if not pd.isna(val):
+                bounds[col] = bound
+        return bounds
+
+    def describe(self, data):
+        # Same layout as data.describe(include='all'), assembled from per-column results
+        summaries = [self.get(data, col, 'describe') for col in data.columns]
+        names = []
+        for index in sorted((summary.index for summary in summaries), key=len):
+            names.extend(name for name in index if name not in names)
+        return pd.concat([summary.reindex(names) for summary in summaries], axis=1, keys=data.columns)
+
+    def corr(self, data, columns):
+        with self.lock:
+            if data is not self.frame:
+                return data[columns].corr()
+            pairs = dict(self.pairs)
+            versions = {col: self.column_versions.get(col) for col in columns}
+        missing = [col for col in columns if (col, col) not in pairs]
+        if len(missing) == len(columns):
+            matrix = data[columns].corr()
+            for a in columns:
+                for b in columns:
+                    pairs[(a, b)] = matrix.at[a, b]
+        else:
+            # Only the changed columns are correlated against the rest
+            for col in missing:
+                against = data[columns].corrwith(data[col])
+                for other, value in against.items():
+                    pairs[(col, other)] = pairs[(other, col)] = value
+            for a in columns:
+                for b in columns:
+                    if (a, b) not in pairs:
+                        pairs[(a, b)] = pairs[(b, a)] = data[a].corr(data[b])
+        with self.lock:
+            # Pairs of columns changed meanwhile are left out of the cache
+            current = {col for col in columns if self.column_versions.get(col) == versions[col]}
+            if data is self.frame:
+                self.pairs.update({(a, b): pairs[(a, b)] for a in current for b in current})
+        return pd.DataFrame([[pairs[(a, b)] for b in columns] for a in columns],
+                            index=columns, columns=columns)
@@ -0,0 +1,188 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    # One background job. The worker function receives the task so it can
+    # report progress and stop early once cancelled.
+    def __init__(self, label, channel=None, on_done=None, on_error=None, on_cancel=None,
+                 cancel_hook=None, progress_text=None, fraction=None, on_progress=None):
+        self.label = label
+        self.channel = channel
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.on_progress = on_progress
+        self.updates = queue.SimpleQueue()
+        self.cancel_hook = cancel_hook
+        self.progress_text = progress_text
+        self.fraction = fraction
+        self.message = ""
+        self.progress = None
+        self.cancel_event = threading.Event()
+        self.start_time = time.perf_counter()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.cancel_hook is not None:
+            self.cancel_hook()
+
+    def check(self):
+        # Workers call this between steps to stop once cancelled
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def set_progress(self, progress=None, message=None):
+        self.progress = progress
+        if message is not None:
+            self.message = message
+
+    def emit(self, value):
+        # Partial results from the worker, handed to on_progress on the main thread
+        self.updates.put(value)
+
+    def drain(self):
+        while True:
+            try:
+                value = self.updates.get_nowait()
+            except queue.Empty:
+                return
+            if self.on_progress is not None and not self.cancelled:
+                self.on_progress(value)
+
+    def status_text(self):
+        if self.progress_text is not None:
+            return self.progress_text()
+        text = f"{self.label}..."
+        if self.message:
+            text += f" {self.message}"
+        return text + f" ({time.perf_counter() - self.start_time:.1f}s)"
+
+    def current_fraction(self):
+        return self.fraction() if self.fraction is not None else self.progress
+
+
+class TaskExecutor:
+    # Runs heavy work on a thread pool so the Tk mainloop never blocks.
+    # Results come back on the main thread through root.after polling, and
+    # the status bar shows what is running with a progress bar and Cancel.
+    # A channel allows one job at a time (e.g. everything that replaces the data).
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+        self.tasks = []
+        self.polling = False
+
+    def setup_ui(self, parent):
+        self.status_frame = ttk.Frame(parent)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 5))
+        self.status_label = ttk.Label(self.status_frame, text="Ready")
+        self.status_label.pack(side=tk.LEFT)
+        self.cancel_btn = ttk.Button(self.status_frame, text="Cancel", command=self.cancel_all, state='disabled')
+        self.cancel_btn.pack(side=tk.RIGHT)
+        self.progress_bar = ttk.Progressbar(self.status_frame, length=200, maximum=1.0)
+        self.progress_bar.pack(side=tk.RIGHT, padx=10)
+
+    def running(self, channel):
+        for task in self.tasks:
+            if task.channel == channel:
+                return task
+        return None
+
+    def submit(self, label, func, on_done=None, on_error=None, on_cancel=None, channel=None,
+               cancel_hook=None, progress_text=None, fraction=None, on_progress=None):
+        # func(task) runs on a worker thread; callbacks run on the main thread.
+        # Returns the Task, or None when the channel is busy.
+        if channel is not None:
+            busy = self.running(channel)
+            if busy is not None:
+                messagebox.showwarning("Busy", f"Please wait for \"{busy.label}\" to finish or cancel it")
+                return None
+        task = Task(label, channel, on_done, on_error, on_cancel, cancel_hook, progress_text, fraction, on_progress)
+        task.future = self.pool.submit(func, task)
+        self.tasks.append(task)
+        self.update_status()
+        if not self.polling:
+            self.polling = True
+            self.root.after(100, self.poll)
+        return task
+
+    def run_loader(self, label, loader, on_finished, channel='data'):
+        # BackgroundLoader subclasses keep their own progress and cancel flag
+        loader.start_time = time.perf_counter()
+        return self.submit(label, lambda task: loader.run(), on_done=lambda result: on_finished(loader),
+                           on_error=lambda e: on_finished(loader), on_cancel=lambda: on_finished(loader),
+                           channel=channel, cancel_hook=loader.cancel,
+                           progress_text=loader.progress_text, fraction=lambda: loader.fraction)
+
+    def poll(self):
+        finished = [task for task in self.tasks if task.future.done()]
+        for task in finished:
+            self.tasks.remove(task)
+        for task in list(self.tasks):
+            task.drain()
+        for task in finished:
+            task.drain()
+            self.finish(task)
+        self.update_status()
+        if self.tasks:
+            self.root.after(100, self.poll)
+        else:
+            self.polling = False
+
+    def finish(self, task):
+        error = task.future.exception()
+        if task.cancelled or isinstance(error, TaskCancelled):
+            if task.on_cancel is not None:
+                task.on_cancel()
+        elif error is not None:
+            if task.on_error is not None:
+                task.on_error(error)
+            else:
+                messagebox.showerror("Error", f"{task.label} failed:\n{str(error)}")
+        elif task.on_done is not None:
+            task.on_done(task.future.result())
+
+    def update_status(self):
+        if not self.tasks:
+            self.status_label.config(text="Ready")
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', value=0)
+            self.cancel_btn.config(state='disabled')
+            return
+        task = self.tasks[-1]
+        text = task.status_text()
+        if len(self.tasks) > 1:
+            text += f" (+{len(self.tasks) - 1} more)"
+        self.status_label.config(text=text)
+        self.cancel_btn.config(state=tk.NORMAL)
+        fraction = task.current_fraction()
+        if fraction is None:
+            if str(self.progress_bar['mode']) != 'indeterminate':
+                self.progress_bar.config(mode='indeterminate', maximum=100)
+                self.progress_bar.start(20)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', maximum=1.0, value=min(max(fraction, 0), 1))
+
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+        self.status_label.config(text="Cancelling...")
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -1,19 +1,21 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import seaborn as sns
+from matplotlib import style as mpl_style
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from sklearn.linear_model import LinearRegression
-from statsmodels.tsa.seasonal import seasonal_decompose
+from tabs.canvas import PlotCanvas
+from tabs.plots import prepare_plot, render_plot, recolor, PlotCache
+from tabs.density import DENSITY_ROWS
+from tabs.decimate import METHODS
+from tabs.pairgrid import PairGrid, pair_counts, PAIR_COLUMNS, PAIR_SAMPLE
 
 class VisualizationManager:
     def __init__(self, app):
         self.app = app
-        self.figure = None
-        self.canvas = None
-        self.toolbar = None
+        # One canvas for the tab's lifetime, and the spec and artists of the plot on it
+        self.plot_canvas = None
+        self.current = None
+        self.plot_cache = PlotCache()
     
     def setup_ui(self, parent):
         # Header
@@ -48,9 +50,19 @@ class VisualizationManager:
             "Bar Chart", "Heatmap", "Pair Plot", "Regression Plot",
             "Time Series Decomposition"
         ], state='disabled', width=20)
-        self.plot_type.grid(row=0, column=0, padx=5, pady=5)
+        self.plot_type.grid(row=0, column=0, columnspan=2, padx=5, pady=5)
         self.plot_type.bind('<<ComboboxSelected>>', self.on_plot_type_change)
         
+        # Pair plot limits: at most this many columns over a row sample (0 = all rows)
+        ttk.Label(plot_frame, text="Pair columns:").grid(row=1, column=0, padx=5, pady=2, sticky=tk.W)
+        self.pair_columns = tk.StringVar(value=str(PAIR_COLUMNS))
+        ttk.Spinbox(plot_frame, from_=2, to=50, increment=1, width=8,
+                    textvariable=self.pair_columns).grid(row=1, column=1, padx=5, pady=2)
+        ttk.Label(plot_frame, text="Pair sample rows:").grid(row=2, column=0, padx=5, pady=2, sticky=tk.W)
+        self.pair_sample = tk.StringVar(value=str(PAIR_SAMPLE))
+        ttk.Spinbox(plot_frame, from_=0, to=100000000, increment=10000, width=8,
+                    textvariable=self.pair_sample).grid(row=2, column=1, padx=5, pady=2)
+        
         # Styling options
         style_frame = ttk.LabelFrame(control_frame, text="Style")
         style_frame.pack(side=tk.LEFT, padx=10, pady=5, fill=tk.X, expand=True)
@@ -74,6 +86,17 @@ class VisualizationManager:
         self.style_var.set('classic')
         self.style_var.grid(row=0, column=3, padx=5, pady=2)
         
+        # Large scatter plots are binned into a density image instead of one marker per row
+        self.density_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(style_frame, text=f"Density scatter over {DENSITY_ROWS:,} rows",
+                        variable=self.density_var).grid(row=1, column=2, columnspan=2, padx=5, pady=2, sticky=tk.W)
+        
+        # Long line charts keep about two points per pixel of the visible range
+        ttk.Label(style_frame, text="Lines:").grid(row=2, column=0, padx=5, pady=2, sticky=tk.W)
+        self.decimate_var = ttk.Combobox(style_frame, values=list(METHODS), state='readonly', width=10)
+        self.decimate_var.set("min-max")
+        self.decimate_var.grid(row=2, column=1, padx=5, pady=2)
+        
         # Titles
         title_frame = ttk.LabelFrame(control_frame, text="Titles")
         title_frame.pack(side=tk.LEFT, padx=10, pady=5, fill=tk.X, expand=True)
@@ -105,6 +128,7 @@ class VisualizationManager:
         
         self.plot_container = ttk.Frame(plot_area)
         self.plot_container.pack(fill=tk.BOTH, expand=True)
+        self.plot_canvas = PlotCanvas(self.plot_container)
     
     def enable_controls(self):
         self.x_col.config(state='readonly')
@@ -129,7 +153,7 @@ class VisualizationManager:
     def on_plot_type_change(self, event=None):
         plot_type = self.plot_type.get()
         # Disable Y column for plots that don't need it
-        if plot_type in ["Histogram", "Box Plot", "Bar Chart", "Heatmap", "Pair Plot", "Time Series Decomposition"]:
+        if plot_type in ["Histogram", "Box Plot", "Bar Chart", "Heatmap", "Pair Plot"]:
             self.y_col.config(state='disabled')
         else:
             self.y_col.config(state='readonly')
@@ -139,168 +163,177 @@ class VisualizationManager:
         if data is None:
             return
         
-        # Clear previous plot
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        if self.toolbar:
-            self.toolbar.destroy()
-        
         # Get plot parameters
         x_col = self.x_col.get()
         y_col = self.y_col.get() if self.y_col['state'] == 'readonly' else None
         plot_type = self.plot_type.get()
-        
-        # Apply style
-        plt.style.use(self.style_var.get())
-        
-        # Create figure
-        self.figure = plt.Figure(figsize=(10, 6), dpi=100)
-        ax = self.figure.add_subplot(111)
+        labels = {'title': self.title_var.get(), 'xlabel': self.xlabel_var.get(), 'ylabel': self.ylabel_var.get()}
         
         # Get color
         color = self.color_var.get()
         palette = self.palette_var.get()
         
+        warning = self.plot_warning(data, plot_type, x_col, y_col)
+        if warning:
+            messagebox.showwarning("Warning", warning)
+            return
+        
+        # Everything that changes the computed inputs or the artists drawn;
+        # the data version changes whenever the data does
+        column_stats = self.app.data_manager.stats
+        column_stats.attach(data)
+        spec = {'plot_type': plot_type, 'x_col': x_col, 'y_col': y_col, 'style': self.style_var.get(),
+                'version': column_stats.version}
+        if plot_type == "Scatter Plot":
+            spec['density'] = (self.density_var.get() and len(data) > DENSITY_ROWS and
+                               pd.api.types.is_numeric_dtype(data[x_col]) and pd.api.types.is_numeric_dtype(data[y_col]))
+        elif plot_type in ("Line Chart", "Time Series Decomposition"):
+            spec['decimation'] = METHODS.get(self.decimate_var.get())
+        elif plot_type == "Pair Plot":
+            spec.update(self.pair_settings(data))
+        
+        if self.current is not None and self.current['spec'] == spec:
+            # Only the title, labels, color or palette changed
+            self.restyle(labels, color, palette)
+            return
+        
+        # Inputs computed earlier are reused until their columns change
+        key = self.plot_cache.key(data, spec, column_stats)
+        if plot_type == "Pair Plot":
+            self.generate_pair_plot(data, spec, key, color, palette, labels)
+            return
+        inputs = self.plot_cache.get(key)
+        if inputs is not None:
+            self.show_plot(spec, inputs, color, palette, labels)
+            return
+        
+        # Inputs are computed on a worker; the artists are drawn on the mainloop
+        size = self.plot_canvas.size()
+        self.app.run_task(f"Plotting {plot_type or 'data'}", lambda task: prepare_plot(data, spec, size, column_stats),
+                          lambda inputs: self.plot_ready(key, spec, inputs, color, palette, labels),
+                          on_error=lambda e: messagebox.showerror("Plot Error", f"Failed to generate plot:\n{str(e)}"),
+                          channel='plot')
+    
+    def pair_settings(self, data):
         try:
-            if plot_type == "Histogram":
-                data[x_col].hist(ax=ax, color=color)
-                ax.set_title(self.title_var.get())
-                ax.set_xlabel(self.xlabel_var.get())
-                ax.set_ylabel(self.ylabel_var.get())
-            
-            elif plot_type == "Box Plot":
-                sns.boxplot(y=data[x_col], ax=ax, color=color)
-                ax.set_title(self.title_var.get())
-                ax.set_ylabel(self.ylabel_var.get())
-            
-            elif plot_type == "Scatter Plot":
-                data.plot.scatter(x=x_col, y=y_col, ax=ax, color=color)
-                ax.set_title(self.title_var.get())
-                ax.set_xlabel(self.xlabel_var.get())
-                ax.set_ylabel(self.ylabel_var.get())
-            
-            elif plot_type == "Line Chart":
-                data.plot(x=x_col, y=y_col, ax=ax, color=color)
-                ax.set_title(self.title_var.get())
-                ax.set_xlabel(self.xlabel_var.get())
-                ax.set_ylabel(self.ylabel_var.get())
-            
-            elif plot_type == "Bar Chart":
-                if pd.api.types.is_numeric_dtype(data[x_col]):
-                    data[x_col].value_counts().head(10).plot(ax=ax, kind='bar', color=color)
-                else:
-                    data[x_col].value_counts().head(10).plot(ax=ax, kind='bar', color=color)
-                ax.set_title(self.title_var.get())
-                ax.set_xlabel(self.xlabel_var.get())
-                ax.set_ylabel(self.ylabel_var.get())
-            
-            elif plot_type == "Heatmap":
-                num_cols = data.select_dtypes(include=np.number).columns.tolist()
-                if len(num_cols) < 2:
-                    messagebox.showwarning("Warning", "Heatmap requires at least two numeric columns")
-                    return
-                corr = data[num_cols].corr()
-                sns.heatmap(corr, annot=True, fmt=".2f", ax=ax, cmap=palette)
-                ax.set_title(self.title_var.get())
-            
-            elif plot_type == "Pair Plot":
-                num_cols = data.select_dtypes(include=np.number).columns.tolist()
-                if len(num_cols) < 2:
-                    messagebox.showwarning("Warning", "Pair plot requires at least two numeric columns")
-                    return
-                
-                pair_fig = sns.pairplot(data[num_cols], palette=palette)
-                pair_fig.fig.suptitle(self.title_var.get(), y=1.02)
-                
-                # Embed in Tkinter
-                self.canvas = FigureCanvasTkAgg(pair_fig.fig, self.plot_container)
-                self.canvas.draw()
-                self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-                
-                # Add toolbar
-                self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_container)
-                self.toolbar.update()
-                self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-                return
-            
-            elif plot_type == "Regression Plot":
-                if not pd.api.types.is_numeric_dtype(data[x_col]) or not pd.api.types.is_numeric_dtype(data[y_col]):
-                    messagebox.showwarning("Warning", "Regression plot requires two numeric columns")
-                    return
-                
-                sns.regplot(x=x_col, y=y_col, data=data, ax=ax, color=color, 
-                            line_kws={'color': 'red'}, scatter_kws={'alpha': 0.5})
-                ax.set_title(self.title_var.get())
-                ax.set_xlabel(self.xlabel_var.get())
-                ax.set_ylabel(self.ylabel_var.get())
-                
-                # Add regression equation
-                X = data[x_col].values.reshape(-1, 1)
-                y = data[y_col].values
-                model = LinearRegression().fit(X, y)
-                r_sq = model.score(X, y)
-                equation = f"y = {model.coef_[0]:.4f}x + {model.intercept_:.4f}\nR² = {r_sq:.4f}"
-                ax.text(0.05, 0.95, equation, transform=ax.transAxes, 
-                       fontsize=10, verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-            
-            elif plot_type == "Time Series Decomposition":
-                if not pd.api.types.is_datetime64_any_dtype(data[x_col]):
-                    messagebox.showwarning("Warning", "Time series requires datetime column for X")
-                    return
-                
-                if not y_col:
-                    messagebox.showwarning("Warning", "Please select a Y column")
-                    return
-                
-                # Set datetime index
-                ts_data = data.set_index(x_col)[y_col]
-                ts_data = ts_data.asfreq('D').fillna(method='ffill')  # Handle missing dates
-                
-                # Decompose
-                decomposition = seasonal_decompose(ts_data, model='additive', period=30)
-                
-                # Create a 2x2 grid of plots
-                self.figure, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
-                self.figure.suptitle(f"Time Series Decomposition: {y_col}", fontsize=16)
-                
-                # Original time series
-                ts_data.plot(ax=ax1, color=color)
-                ax1.set_title('Original Time Series')
-                ax1.set_ylabel(y_col)
-                
-                # Trend component
-                decomposition.trend.plot(ax=ax2, color='green')
-                ax2.set_title('Trend Component')
-                
-                # Seasonal component
-                decomposition.seasonal.plot(ax=ax3, color='purple')
-                ax3.set_title('Seasonal Component')
-                
-                # Residual component
-                decomposition.resid.plot(ax=ax4, color='red')
-                ax4.set_title('Residual Component')
-                
-                plt.tight_layout()
-                plt.subplots_adjust(top=0.9)
-            
-            # Embed in Tkinter
-            self.canvas = FigureCanvasTkAgg(self.figure, self.plot_container)
-            self.canvas.draw()
-            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            # Add toolbar
-            self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_container)
-            self.toolbar.update()
-            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            # Enable export button
-            self.export_btn.config(state=tk.NORMAL)
-            
+            max_columns = max(2, int(float(self.pair_columns.get())))
+        except ValueError:
+            max_columns = PAIR_COLUMNS
+        try:
+            sample = max(0, int(float(self.pair_sample.get())))
+        except ValueError:
+            sample = PAIR_SAMPLE
+        columns = tuple(data.select_dtypes(include=np.number).columns.tolist()[:max_columns])
+        return {'columns': columns, 'sample': sample}
+    
+    def plot_ready(self, key, spec, inputs, color, palette, labels):
+        self.plot_cache.put(key, inputs)
+        self.show_plot(spec, inputs, color, palette, labels)
+    
+    def show_plot(self, spec, inputs, color, palette, labels):
+        # Redraws the tab's one figure; the style only applies while the artists are created
+        plot_canvas = self.plot_canvas
+        plot_canvas.clear()
+        try:
+            with mpl_style.context(spec['style']):
+                plot_canvas.apply_style()
+                texts, colored, mapped = render_plot(plot_canvas.figure, spec, inputs, color, palette, labels)
+                plot_canvas.animate(texts.values())
+                plot_canvas.draw()  # ticks are created on the first draw
         except Exception as e:
+            self.current = None
+            plot_canvas.clear()
+            plot_canvas.draw()
             messagebox.showerror("Plot Error", f"Failed to generate plot:\n{str(e)}")
+            return
+        self.current = {'spec': spec, 'texts': texts, 'colored': colored, 'mapped': mapped,
+                        'color': color, 'palette': palette}
+        
+        # Enable export button
+        self.export_btn.config(state=tk.NORMAL)
+    
+    def generate_pair_plot(self, data, spec, key, color, palette, labels):
+        # The empty grid is shown at once and filled in as panels are binned;
+        # the binned panels are cached once all of them have arrived
+        columns, sample = list(spec['columns']), spec['sample']
+        cached = self.plot_cache.get(key)
+        if cached is None:
+            updates = []
+            task = self.app.run_task("Building pair plot", lambda task: pair_counts(task, data, columns, sample),
+                                     lambda result: self.plot_cache.put(key, updates),
+                                     on_progress=lambda value: self.update_pair_grid(grid, updates, value),
+                                     on_error=lambda e: messagebox.showerror("Plot Error", f"Failed to generate plot:\n{str(e)}"),
+                                     channel='plot')
+            if task is None:
+                return
+        
+        plot_canvas = self.plot_canvas
+        plot_canvas.clear()
+        with mpl_style.context(spec['style']):
+            plot_canvas.apply_style()
+            grid = PairGrid(plot_canvas.figure, columns, color, palette)
+            title = plot_canvas.figure.suptitle(labels['title'])
+            for value in cached or []:
+                grid.update(value)
+            plot_canvas.animate([title])
+            plot_canvas.draw()
+        self.current = {'spec': spec, 'texts': {'title': title}, 'colored': grid.patches, 'mapped': grid.images,
+                        'color': color, 'palette': palette, 'grid': grid}
+        self.export_btn.config(state=tk.NORMAL)
+    
+    def update_pair_grid(self, grid, updates, value):
+        # Panels of a grid that has since been replaced are only kept for the cache
+        updates.append(value)
+        if self.current is not None and self.current.get('grid') is grid:
+            grid.update(value)
+            self.plot_canvas.draw_idle()
+    
+    def restyle(self, labels, color, palette):
+        # Existing artists are changed in place: text edits are blitted, and
+        # colour or palette changes redraw without recomputing anything
+        current = self.current
+        grid = current.get('grid')
+        if grid is not None:
+            # Panels still to arrive are drawn in the new colours
+            grid.color, grid.cmap = color, palette
+        for field, text in current['texts'].items():
+            text.set_text(labels[field])
+        redraw = False
+        try:
+            if color != current['color']:
+                recolor(current['colored'], color)
+                current['color'] = color
+                redraw = True
+            if palette != current['palette']:
+                for artist in current['mapped']:
+                    artist.set_cmap(palette)
+                current['palette'] = palette
+                redraw = True
+        except ValueError as e:
+            messagebox.showerror("Plot Error", f"Invalid style:\n{str(e)}")
+            return
+        if redraw:
+            self.plot_canvas.draw_idle()
+        else:
+            self.plot_canvas.blit()
+    
+    def plot_warning(self, data, plot_type, x_col, y_col):
+        # Quick checks done before any plotting work is started
+        if plot_type in ("Heatmap", "Pair Plot"):
+            if len(data.select_dtypes(include=np.number).columns) < 2:
+                return f"{'Heatmap' if plot_type == 'Heatmap' else 'Pair plot'} requires at least two numeric columns"
+        elif plot_type == "Regression Plot":
+            if not pd.api.types.is_numeric_dtype(data[x_col]) or not pd.api.types.is_numeric_dtype(data[y_col]):
+                return "Regression plot requires two numeric columns"
+        elif plot_type == "Time Series Decomposition":
+            if not pd.api.types.is_datetime64_any_dtype(data[x_col]):
+                return "Time series requires datetime column for X"
+            if not y_col:
+                return "Please select a Y column"
+        return None
     
     def export_plot(self):
-        if not self.figure:
+        if self.current is None:
             messagebox.showwarning("Warning", "No plot to export")
             return
         
@@ -312,7 +345,7 @@ class VisualizationManager:
             return
         
         try:
-            self.figure.savefig(file_path, bbox_inches='tight')
+            self.plot_canvas.savefig(file_path, bbox_inches='tight')
             messagebox.showinfo("Success", f"Plot exported successfully to:\n{file_path}")
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export plot:\n{str(e)}")
\ No newline at end of file